@@ -1,18 +1,43 @@
 """FastAPI web app for interactive LPWAN simulation."""
 
+import asyncio
+import functools
+import hashlib
 import math
-from fastapi import FastAPI
+import threading
+from collections import OrderedDict
+
+import orjson
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.exceptions import RequestValidationError
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse
-from pydantic import BaseModel
-from typing import List, Dict, Literal, Optional
+from fastapi.responses import HTMLResponse, JSONResponse, Response
+from pydantic import BaseModel, ValidationError
+from typing import Any, List, Dict, Literal, Optional, Tuple, Union
 import numpy as np
+import numpy.typing as npt
 
 from lpwan_sim.core import Environment, Transmitter, Gateway, NoiseSource, Simulation
 from lpwan_sim.core.environment import Obstacle, MATERIAL_ATTENUATION
 from lpwan_sim.protocols import LoRaWAN, NBIoT, WiFiHaLow
 
-app = FastAPI(title="LPWAN Simulator")
+class _SimulatorAPI(FastAPI):
+    def openapi(self) -> Dict[str, Any]:
+        # Adds the hand-parsed /api/simulate body (see _SIM_CONFIG_SCHEMA)
+        schema = super().openapi()
+        schema.setdefault("components", {}).setdefault("schemas", {}).update(
+            {"SimConfig": _SIM_CONFIG_SCHEMA, **_SIM_CONFIG_DEFS}
+        )
+        return schema
+
+app = _SimulatorAPI(title="LPWAN Simulator")
+
+
+class NumpyJSONResponse(JSONResponse):
+    """JSON response that serializes ndarrays straight from their buffers via orjson."""
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_SERIALIZE_NUMPY)
 
 # ============================================================================
 # Material attenuation map (dB)
@@ -50,6 +75,11 @@ def height_gain_db(height_m: float, reference_m: float = 1.0) -> float:
         return 0.0
     return 6.0 * math.log10(height_m / reference_m)
 
+def height_gains_db(heights_m: npt.ArrayLike, reference_m: float = 1.0) -> np.ndarray:
+    """Vectorized :func:`height_gain_db` over an array of heights."""
+    h = np.maximum(np.asarray(heights_m, dtype=np.float64), reference_m)
+    return 6.0 * np.log10(h / reference_m)
+
 # ============================================================================
 # Data models
 # ============================================================================
@@ -83,7 +113,7 @@ class SimConfig(BaseModel):
 # ============================================================================
 # Per-technology receiver sensitivity and noise figure
 # ============================================================================
-TECH_SENSITIVITY = {
+TECH_SENSITIVITY: Dict[str, Union[float, Dict[int, float]]] = {
     "halow": -95.0,
     "lorawan": {
         7: -123.0, 8: -126.0, 9: -129.0,
@@ -104,27 +134,56 @@ ENV_PATH_LOSS_EXPONENT = {
     "rural": 2.0,
 }
 
-def rect_to_obstacle_segments(obs: RectObstacle) -> List[Obstacle]:
-    x1 = obs.position.x * 1000
-    y1 = obs.position.y * 1000
-    x2 = x1 + obs.width_km * 1000
-    y2 = y1 + obs.height_km * 1000
-    att = MATERIAL_DB.get(obs.material, 10.0)
-    
-    if obs.type == "house":
-        att = MATERIAL_DB.get("brick", 10.0)
-    elif obs.type == "water":
-        att = MATERIAL_DB.get("water", 12.0)
-    elif obs.type == "forest":
-        att = MATERIAL_DB.get("foliage", 8.0)
-    elif obs.type == "water_tower":
-        att = MATERIAL_DB.get("water_tower", 15.0)
+# Wire encoding of the output grids: value = q * scale + offset, q in uint8.
+# 0.5 dB steps over a 127.5 dB window is well below what the heatmap shows.
+GRID_ENCODING = {
+    "rssi": {"scale": 0.5, "offset": -160.0},
+    "snr": {"scale": 0.5, "offset": -20.0},
+    "interference": {"scale": 0.5, "offset": -160.0},
+}
+
+def quantize_grid(grid: np.ndarray, scale: float, offset: float) -> np.ndarray:
+    """Quantize a dB grid to uint8 steps of *scale* above *offset* (saturating)."""
+    q = np.round((grid - offset) / scale)
+    return np.clip(q, 0, 255, out=q).astype(np.uint8)
+
+# Obstacle types that override the user-selected material
+OBS_TYPE_MATERIAL = {
+    "house": "brick",
+    "water": "water",
+    "forest": "foliage",
+    "water_tower": "water_tower",
+}
+
+# Attenuation of the overriding obstacle types, resolved once at import
+_OBS_TYPE_ATT = {t: MATERIAL_DB.get(m, 10.0) for t, m in OBS_TYPE_MATERIAL.items()}
+
+def obstacle_attenuation_db(obs: RectObstacle) -> float:
+    att = _OBS_TYPE_ATT.get(obs.type)
+    return att if att is not None else MATERIAL_DB.get(obs.material, 10.0)
+
+def obstacle_rects(obstacles: List[RectObstacle]) -> np.ndarray:
+    """Pack obstacles into an ``(O, 5)`` float64 array of ``[x1, y1, x2, y2, att]`` in metres.
+
+    Corners are stored absolute (min and max), so intersection tests need
+    no per-cell ``x + width`` additions.
+    """
+    rects = np.empty((len(obstacles), 5), dtype=np.float64)
+    for k, obs in enumerate(obstacles):
+        x1 = obs.position.x * 1000
+        y1 = obs.position.y * 1000
+        rects[k] = (x1, y1, x1 + obs.width_km * 1000, y1 + obs.height_km * 1000,
+                    obstacle_attenuation_db(obs))
+    return rects
+
+def rect_to_obstacle_segments(rect: np.ndarray, material: str) -> List[Obstacle]:
+    x1, y1, x2, y2, att = (float(v) for v in rect)
     
     segments = [
-        Obstacle(start_point=(x1, y1), end_point=(x2, y1), attenuation_db=att, material=obs.material),
-        Obstacle(start_point=(x2, y1), end_point=(x2, y2), attenuation_db=att, material=obs.material),
-        Obstacle(start_point=(x2, y2), end_point=(x1, y2), attenuation_db=att, material=obs.material),
-        Obstacle(start_point=(x1, y2), end_point=(x1, y1), attenuation_db=att, material=obs.material),
+        Obstacle(start_point=(x1, y1), end_point=(x2, y1), attenuation_db=att, material=material),
+        Obstacle(start_point=(x2, y1), end_point=(x2, y2), attenuation_db=att, material=material),
+        Obstacle(start_point=(x2, y2), end_point=(x1, y2), attenuation_db=att, material=material),
+        Obstacle(start_point=(x1, y2), end_point=(x1, y1), attenuation_db=att, material=material),
     ]
     return segments
 
@@ -144,168 +203,314 @@ def get_device_freq_mhz(dev: dict) -> float:
         return dev.get("frequency_mhz", 925.0)
     return 900.0
 
+def channel_edges(freq_mhz, bw_khz):
+    """``(low, high)`` channel edges in MHz; works on scalars and arrays."""
+    half_bw = bw_khz / 2000.0
+    return freq_mhz - half_bw, freq_mhz + half_bw
+
 def freqs_overlap(f1: float, bw1_khz: float, f2: float, bw2_khz: float) -> bool:
-    low1 = f1 - bw1_khz / 2000.0
-    high1 = f1 + bw1_khz / 2000.0
-    low2 = f2 - bw2_khz / 2000.0
-    high2 = f2 + bw2_khz / 2000.0
+    low1, high1 = channel_edges(f1, bw1_khz)
+    low2, high2 = channel_edges(f2, bw2_khz)
     return low1 < high2 and low2 < high1
 
-def _line_intersects_rect(x1, y1, x2, y2, rx, ry, rw, rh):
-    """Check if line segment (x1,y1)-(x2,y2) intersects rectangle (rx,ry,rw,rh)."""
-    # Cohen-Sutherland style clipping test
-    def _outcode(x, y):
-        c = 0
-        if x < rx: c |= 1
-        elif x > rx + rw: c |= 2
-        if y < ry: c |= 4
-        elif y > ry + rh: c |= 8
-        return c
-    
-    c1, c2 = _outcode(x1, y1), _outcode(x2, y2)
-    for _ in range(10):
-        if (c1 | c2) == 0:
-            return True  # both inside
-        if (c1 & c2) != 0:
-            return False  # both outside same side
-        c = c1 if c1 else c2
-        dx, dy = x2 - x1, y2 - y1
-        if c & 1:
-            y = y1 + dy * (rx - x1) / dx if dx else y1; x = rx
-        elif c & 2:
-            y = y1 + dy * (rx + rw - x1) / dx if dx else y1; x = rx + rw
-        elif c & 4:
-            x = x1 + dx * (ry - y1) / dy if dy else x1; y = ry
-        else:
-            x = x1 + dx * (ry + rh - y1) / dy if dy else x1; y = ry + rh
-        if c == c1:
-            x1, y1, c1 = x, y, _outcode(x, y)
+def _interferer_counts(device_info) -> np.ndarray:
+    """Number of other devices whose channel overlaps each device's channel.
+
+    Equivalent to calling :func:`freqs_overlap` on every ordered pair, but
+    O(N log N): over the sorted channel edges, the devices overlapping
+    ``[low, high)`` are those starting below ``high`` minus those ending at
+    or before ``low``. Power meters count zero and are not counted: they are
+    already added as noise sources.
+    """
+    counts = np.zeros(len(device_info), dtype=np.intp)
+    if not device_info:
+        return counts
+    f = np.array([d[0] for d in device_info], dtype=np.float64)
+    bw = np.array([d[1] for d in device_info], dtype=np.float64)
+    active = np.array([d[5] != "power_meter" for d in device_info])
+    low, high = channel_edges(f[active], bw[active])
+    starts_below = np.searchsorted(np.sort(low), high, side="left")
+    ends_by = np.searchsorted(np.sort(high), low, side="right")
+    n = starts_below - ends_by
+    point = low == high
+    if point.any():
+        # A zero-width channel at p overlaps nothing ending at p, yet every
+        # zero-width channel at p (itself included) was subtracted above
+        pts = np.sort(low[point])
+        same = np.searchsorted(pts, low[point], "right") - np.searchsorted(pts, low[point], "left")
+        n[point] += same
+    # Every non-empty channel overlaps itself; don't count it
+    counts[active] = n - ~point
+    return counts
+
+
+def _slab_interval_vec(p, d, lo, hi):
+    """Parameter interval ``(t_enter, t_exit)`` over which ``p + t*d`` lies in
+    the slab ``[lo, hi]``, for scalar ``p``, array ``d`` and scalar or array
+    (broadcastable) bounds. Where ``d == 0`` it is ``(-inf, inf)`` if ``p`` is
+    inside the slab and empty (``(inf, -inf)``) otherwise."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t1 = (lo - p) / d
+        t2 = (hi - p) / d
+    parallel = d == 0.0
+    inf = np.where((lo <= p) & (p <= hi), np.inf, -np.inf)
+    t_enter = np.where(parallel, -inf, np.minimum(t1, t2))
+    t_exit = np.where(parallel, inf, np.maximum(t1, t2))
+    return t_enter, t_exit
+
+
+def _ray_hits_rect_vec(x1, y1, cell_xs, cell_ys, ox1, oy1, ox2, oy2, t_lo=0.01, t_hi=0.99):
+    """Vectorized slab test: does the ray (x1,y1)->(cell) cross an edge of rect [ox1,ox2]x[oy1,oy2]?
+
+    A hit is a boundary crossing (entry or exit) at ``t_lo < t < t_hi``, so
+    obstacles touching the transmitter or the cell itself are not counted,
+    and a ray from a transmitter inside an obstacle only hits it if it
+    leaves within the window. ``cell_xs`` and ``cell_ys`` broadcast against
+    each other (e.g. a ``(1, cols)`` row and a ``(rows, 1)`` column); the
+    boolean result has their broadcast shape.
+    """
+    tx_enter, tx_exit = _slab_interval_vec(x1, cell_xs - x1, ox1, ox2)
+    ty_enter, ty_exit = _slab_interval_vec(y1, cell_ys - y1, oy1, oy2)
+    # The ray is in the rect over [max(tx_enter, ty_enter), min(tx_exit, ty_exit)].
+    # Every max/min compare below is split into per-axis terms (cheap on 1-D
+    # inputs) joined by boolean ops, so no float temporary of the broadcast
+    # shape is ever materialized
+    valid = (tx_enter <= tx_exit) & (ty_enter <= ty_exit) & (tx_enter <= ty_exit) & (ty_enter <= tx_exit)
+    enters = ((tx_enter > t_lo) | (ty_enter > t_lo)) & ((tx_enter < t_hi) & (ty_enter < t_hi))
+    exits = ((tx_exit > t_lo) & (ty_exit > t_lo)) & ((tx_exit < t_hi) | (ty_exit < t_hi))
+    return valid & (enters | exits)
+
+
+def _near_spans(tx_xy, cell_xs, cell_ys, obs_rects):
+    """Reachable sub-grid of every (transmitter, obstacle) pair at once.
+
+    Per axis, a ray from the transmitter at ``t`` to a cell at ``c`` can
+    only reach the obstacle ``[lo, hi]`` if ``min(c, t) <= hi`` and
+    ``max(c, t) >= lo``; over sorted cell coordinates that is a contiguous
+    index range. Returns ``(row_start, row_stop, col_start, col_stop)`` int
+    arrays shaped ``(T, O)`` for the ``(T, 2)`` transmitter positions.
+    """
+    tx = tx_xy[:, 0, None]
+    ty = tx_xy[:, 1, None]
+    ox1, oy1, ox2, oy2 = obs_rects[:, 0], obs_rects[:, 1], obs_rects[:, 2], obs_rects[:, 3]
+    row_start = np.where(ty < oy1, np.searchsorted(cell_ys, oy1, side="left"), 0)
+    row_stop = np.where(ty > oy2, np.searchsorted(cell_ys, oy2, side="right"), len(cell_ys))
+    col_start = np.where(tx < ox1, np.searchsorted(cell_xs, ox1, side="left"), 0)
+    col_stop = np.where(tx > ox2, np.searchsorted(cell_xs, ox2, side="right"), len(cell_xs))
+    return row_start, row_stop, col_start, col_stop
+
+
+def _inside_attenuation(cell_xs, cell_ys, obs_rects):
+    """Doubled attenuation (dB) of every obstacle containing each cell centre.
+
+    Cells inside an obstacle pay its attenuation twice whatever the
+    transmitter, so this ``(rows, cols)`` float32 grid is computed once per
+    simulation rather than once per transmitter.
+    """
+    att_grid = np.zeros((len(cell_ys), len(cell_xs)), dtype=np.float32)
+    for ox1, oy1, ox2, oy2, att in obs_rects:
+        cols = np.flatnonzero((cell_xs >= ox1) & (cell_xs <= ox2))
+        rows = np.flatnonzero((cell_ys >= oy1) & (cell_ys <= oy2))
+        if cols.size and rows.size:
+            # Cell coordinates are sorted, so the covered cells are a block
+            att_grid[rows[0]:rows[-1] + 1, cols[0]:cols[-1] + 1] += att * 2
+    return att_grid
+
+
+# Obstacles are tested in batches of up to SHADOW_BATCH, broadcast as one
+# (K, rows, cols) block when that is not much more work than testing each
+# obstacle on its own sub-grid. _SHADOW_CALL_CELLS is the fixed per-obstacle
+# Python/NumPy dispatch cost expressed in cells.
+SHADOW_BATCH = 16
+_SHADOW_CALL_CELLS = 16384
+
+
+def _add_crossings(att_grid, tx_x, tx_y, cell_xs, cell_ys, rects, rows, cols):
+    """Add the attenuation of every ray crossing of ``rects`` to ``att_grid[rows, cols]``.
+
+    ``rects`` is a ``(K, 5)`` slice of obstacle rows, tested together as a
+    ``(K, rows, cols)`` broadcast. Cells inside an obstacle are skipped;
+    they carry their share via :func:`_inside_attenuation`.
+    """
+    if len(rects) == 1:
+        (ox1, oy1, ox2, oy2, att), = rects
+        xs = cell_xs[cols][None, :]
+        ys = cell_ys[rows][:, None]
+    else:
+        ox1, oy1, ox2, oy2, att = (rects[:, k, None, None] for k in range(5))
+        xs = cell_xs[cols][None, None, :]
+        ys = cell_ys[rows][None, :, None]
+    hits = _ray_hits_rect_vec(tx_x, tx_y, xs, ys, ox1, oy1, ox2, oy2)
+    hits &= ~(((xs >= ox1) & (xs <= ox2)) & ((ys >= oy1) & (ys <= oy2)))
+    block = att_grid[rows, cols]
+    if len(rects) == 1:
+        np.add(block, att, out=block, where=hits)
+    else:
+        block += np.tensordot(rects[:, 4].astype(np.float32), hits, axes=1)
+
+
+def _shadow_kernel(tx_x, tx_y, cell_xs, cell_ys, obs_rects, inside_att=None, spans=None):
+    """Cumulative obstacle attenuation (dB) on the ray from one TX to every cell.
+
+    ``cell_xs`` (cols,) and ``cell_ys`` (rows,) are the 1-D cell-centre
+    coordinates; the returned float32 grid is ``(rows, cols)``.
+    ``obs_rects`` is an ``(O, 5)`` float64 array of ``[x1, y1, x2, y2, att]``
+    rows in metres; cells inside an obstacle pay its attenuation twice.
+    ``inside_att`` is the transmitter-independent :func:`_inside_attenuation`
+    grid and ``spans`` this transmitter's row of :func:`_near_spans`; pass
+    them when calling for several transmitters so they are computed for all
+    of them at once.
+    """
+    if inside_att is None:
+        inside_att = _inside_attenuation(cell_xs, cell_ys, obs_rects)
+    if spans is None:
+        spans = [a[0] for a in _near_spans(np.array([[tx_x, tx_y]]), cell_xs, cell_ys, obs_rects)]
+    att_grid = inside_att.copy()
+    # AABB pre-filter: only cells whose ray bounding box overlaps an
+    # obstacle can be shadowed by it; that is a contiguous block per obstacle
+    r0, r1, c0, c1 = spans
+    live = np.flatnonzero((r0 < r1) & (c0 < c1))
+    for b in range(0, len(live), SHADOW_BATCH):
+        idx = live[b:b + SHADOW_BATCH]
+        rows = slice(r0[idx].min(), r1[idx].max())
+        cols = slice(c0[idx].min(), c1[idx].max())
+        own = int(((r1[idx] - r0[idx]) * (c1[idx] - c0[idx])).sum())
+        union = (rows.stop - rows.start) * (cols.stop - cols.start)
+        if len(idx) > 1 and len(idx) * union <= own + len(idx) * _SHADOW_CALL_CELLS:
+            _add_crossings(att_grid, tx_x, tx_y, cell_xs, cell_ys, obs_rects[idx], rows, cols)
         else:
-            x2, y2, c2 = x, y, _outcode(x, y)
-    return False
+            for k in idx:
+                _add_crossings(att_grid, tx_x, tx_y, cell_xs, cell_ys, obs_rects[k:k + 1],
+                               slice(r0[k], r1[k]), slice(c0[k], c1[k]))
+    return att_grid
 
 
-def _ray_intersects_rect_vectorized(tx_x, tx_y, cell_xs, cell_ys, rx, ry, rw, rh):
-    """Vectorized: for each cell, check if ray from (tx_x,tx_y) to (cell_x,cell_y) intersects rect.
-    Returns boolean array of shape (N,)."""
-    N = len(cell_xs)
-    result = np.zeros(N, dtype=bool)
-    
-    # Parametric ray: P = tx + t*(cell - tx), t in [0,1]
-    dx = cell_xs - tx_x
-    dy = cell_ys - tx_y
-    
-    # Check each of 4 edges
-    # Left edge: x = rx
-    mask = np.abs(dx) > 1e-6
-    t_left = np.full(N, -1.0)
-    t_left[mask] = (rx - tx_x) / dx[mask]
-    y_at_left = tx_y + t_left * dy
-    hit_left = (t_left > 0.01) & (t_left < 0.99) & (y_at_left >= ry) & (y_at_left <= ry + rh)
-    
-    # Right edge: x = rx + rw  
-    t_right = np.full(N, -1.0)
-    t_right[mask] = (rx + rw - tx_x) / dx[mask]
-    y_at_right = tx_y + t_right * dy
-    hit_right = (t_right > 0.01) & (t_right < 0.99) & (y_at_right >= ry) & (y_at_right <= ry + rh)
-    
-    # Top edge: y = ry
-    mask2 = np.abs(dy) > 1e-6
-    t_top = np.full(N, -1.0)
-    t_top[mask2] = (ry - tx_y) / dy[mask2]
-    x_at_top = tx_x + t_top * dx
-    hit_top = (t_top > 0.01) & (t_top < 0.99) & (x_at_top >= rx) & (x_at_top <= rx + rw)
-    
-    # Bottom edge: y = ry + rh
-    t_bot = np.full(N, -1.0)
-    t_bot[mask2] = (ry + rh - tx_y) / dy[mask2]
-    x_at_bot = tx_x + t_bot * dx
-    hit_bot = (t_bot > 0.01) & (t_bot < 0.99) & (x_at_bot >= rx) & (x_at_bot <= rx + rw)
-    
-    result = hit_left | hit_right | hit_top | hit_bot
-    
-    # Also check if cell is inside the rect
-    inside = (cell_xs >= rx) & (cell_xs <= rx + rw) & (cell_ys >= ry) & (cell_ys <= ry + rh)
-    
-    return result, inside
+@functools.lru_cache(maxsize=8)
+def _cell_coords(rows: int, cols: int, res_m: float):
+    """Read-only 1-D cell-centre coordinates ``(cell_xs, cell_ys)`` in metres.
 
+    Cached because the UI re-simulates the same grid over and over.
+    """
+    cell_xs = np.arange(cols) * res_m + res_m / 2
+    cell_ys = np.arange(rows) * res_m + res_m / 2
+    cell_xs.setflags(write=False)
+    cell_ys.setflags(write=False)
+    return cell_xs, cell_ys
+
+
+# Per-TX shadow grids keyed by (rows, cols, res_m, obstacle bytes, tx_x, tx_y):
+# UI edits that leave the geometry alone (powers, channels, fading, moving
+# one device) skip the shadow kernel for every unchanged transmitter.
+SHADOW_CACHE_MAX_BYTES = 64 * 1024 * 1024
+_shadow_cache: "OrderedDict[tuple, np.ndarray]" = OrderedDict()
+_shadow_cache_nbytes = 0
+_shadow_cache_lock = threading.Lock()  # simulations run in worker threads
+
+def _shadow_cache_get(key: tuple) -> Optional[np.ndarray]:
+    with _shadow_cache_lock:
+        grid = _shadow_cache.get(key)
+        if grid is not None:
+            _shadow_cache.move_to_end(key)
+        return grid
+
+def _shadow_cache_put(key: tuple, grid: np.ndarray) -> None:
+    global _shadow_cache_nbytes
+    grid.setflags(write=False)  # shared across requests
+    with _shadow_cache_lock:
+        if key in _shadow_cache:
+            return
+        _shadow_cache[key] = grid
+        _shadow_cache_nbytes += grid.nbytes
+        while len(_shadow_cache) > 1 and _shadow_cache_nbytes > SHADOW_CACHE_MAX_BYTES:
+            _, evicted = _shadow_cache.popitem(last=False)
+            _shadow_cache_nbytes -= evicted.nbytes
 
-def _apply_obstacle_shadows(result, config, device_info):
+
+def _fold_max(best, grid):
+    """Running elementwise max: ``grid`` copied on first use, then in place."""
+    if best is None:
+        return grid.copy()
+    return np.maximum(best, grid, out=best)
+
+
+def _apply_obstacle_shadows(result, obs_rects, config, device_info):
     """Post-process RSSI grid: subtract obstacle attenuation for shadowed cells.
-    Vectorized with numpy for performance on large grids."""
-    if not config.obstacles:
+    Vectorized with numpy for performance on large grids.
+
+    ``obs_rects`` is the ``(O, 5)`` array from :func:`obstacle_rects`."""
+    if len(obs_rects) == 0:
         return
     
     rows, cols = result.best_rssi.shape
     res_m = config.resolution_m
+    # Shadow grids depend only on this and the TX position (taken before the
+    # obstacle filter below, which depends on the whole TX set)
+    scene = (rows, cols, res_m, obs_rects.tobytes())
     
-    # Collect transmitter positions in meters (exclude power_meters)
-    tx_positions = []
-    for freq, bw, x_m, y_m, pwr, tech in device_info:
-        if tech != "power_meter":
-            tx_positions.append((x_m, y_m))
-    
-    if not tx_positions:
+    # Nothing to shadow unless at least one real transmitter exists
+    if all(tech == "power_meter" for *_, tech in device_info):
         return
-    
-    tx_arr = np.array(tx_positions)  # shape (num_tx, 2)
-    
-    # Build obstacle rectangles in meters
-    obs_rects = []
-    for obs in config.obstacles:
-        ox = obs.position.x * 1000
-        oy = obs.position.y * 1000
-        ow = obs.width_km * 1000
-        oh = obs.height_km * 1000
-        if obs.type == "house":
-            att = MATERIAL_DB.get("brick", 10.0)
-        elif obs.type == "water":
-            att = MATERIAL_DB.get("water", 12.0)
-        elif obs.type == "forest":
-            att = MATERIAL_DB.get("foliage", 8.0)
-        elif obs.type == "water_tower":
-            att = MATERIAL_DB.get("water_tower", 15.0)
-        else:
-            att = MATERIAL_DB.get(obs.material, 10.0)
-        obs_rects.append((ox, oy, ow, oh, att))
-    
-    # Build cell coordinate grids
-    cell_ys = np.arange(rows) * res_m + res_m / 2
-    cell_xs = np.arange(cols) * res_m + res_m / 2
-    cx_grid, cy_grid = np.meshgrid(cell_xs, cell_ys)
-    cx_flat = cx_grid.ravel()
-    cy_flat = cy_grid.ravel()
-    N = len(cx_flat)
-    
+
     # For EACH transmitter, compute its obstacle attenuation grid,
     # then apply to that transmitter's per-label RSSI.
     # Map TX positions to their labels
+    # Label by position rounded to the metre, first device wins
+    label_by_pos = {}
+    for dev in config.devices:
+        pos = (round(dev["position"]["x"] * 1000), round(dev["position"]["y"] * 1000))
+        label_by_pos.setdefault(pos, dev.get("label", ""))
     tx_label_map = {}  # (tx_x, tx_y) -> [label, ...]
     for freq, bw, x_m, y_m, pwr, tech in device_info:
         if tech == "power_meter":
             continue
-        # Find matching label from config devices
-        for dev in config.devices:
-            dev_x = dev["position"]["x"] * 1000
-            dev_y = dev["position"]["y"] * 1000
-            if abs(dev_x - x_m) < 1 and abs(dev_y - y_m) < 1:
-                lbl = dev.get("label", "")
-                key = (x_m, y_m)
-                if key not in tx_label_map:
-                    tx_label_map[key] = []
-                tx_label_map[key].append(lbl)
-                break
+        lbl = label_by_pos.get((round(x_m), round(y_m)))
+        if lbl is not None:
+            tx_label_map.setdefault((x_m, y_m), []).append(lbl)
     
-    # Compute per-TX attenuation and apply to per-label RSSI grids
-    for (tx_x, tx_y), labels in tx_label_map.items():
-        att_flat = np.zeros(N, dtype=np.float64)
-        
-        for ox, oy, ow, oh, att in obs_rects:
-            hits, inside = _ray_intersects_rect_vectorized(tx_x, tx_y, cx_flat, cy_flat, ox, oy, ow, oh)
-            att_flat[inside] += att * 2
-            att_flat[hits & ~inside] += att
-        
-        att_grid = att_flat.reshape(rows, cols)
+    if not tx_label_map:
+        return
+    
+    # Every ray runs between a transmitter and a cell centre, so it stays in
+    # their joint bounding box; obstacles outside it can never shadow a cell
+    cell_xs, cell_ys = _cell_coords(rows, cols, res_m)
+    tx_xy = np.array(list(tx_label_map), dtype=np.float64)
+    lo_x = min(cell_xs[0], tx_xy[:, 0].min())
+    hi_x = max(cell_xs[-1], tx_xy[:, 0].max())
+    lo_y = min(cell_ys[0], tx_xy[:, 1].min())
+    hi_y = max(cell_ys[-1], tx_xy[:, 1].max())
+    obs_rects = obs_rects[
+        (obs_rects[:, 2] >= lo_x) & (obs_rects[:, 0] <= hi_x)
+        & (obs_rects[:, 3] >= lo_y) & (obs_rects[:, 1] <= hi_y)
+    ]
+    if len(obs_rects) == 0:
+        return
+    
+    # Each label's grid joins the running best right after its last
+    # subtraction (labels may repeat across TXs); unshadowed ones up front
+    last_tx = {lbl: i for i, labels in enumerate(tx_label_map.values()) for lbl in labels}
+    best_rssi = best_snr = None
+    for lbl, grid in result.rssi.items():
+        if lbl not in last_tx:
+            best_rssi = _fold_max(best_rssi, grid)
+    for lbl, grid in result.snr.items():
+        if lbl not in last_tx:
+            best_snr = _fold_max(best_snr, grid)
+    
+    # Compute per-TX attenuation (or reuse it from an earlier request with
+    # the same grid, obstacles and TX position) and apply to per-label RSSI
+    # grids; on a miss the inside term and every TX's obstacle spans are
+    # computed once for all transmitters
+    inside_att = spans = None
+    for i, ((tx_x, tx_y), labels) in enumerate(tx_label_map.items()):
+        key = scene + (tx_x, tx_y)
+        att_grid = _shadow_cache_get(key)
+        if att_grid is None:
+            if spans is None:
+                inside_att = _inside_attenuation(cell_xs, cell_ys, obs_rects)
+                spans = _near_spans(tx_xy, cell_xs, cell_ys, obs_rects)
+            att_grid = _shadow_kernel(tx_x, tx_y, cell_xs, cell_ys, obs_rects,
+                                      inside_att=inside_att, spans=[a[i] for a in spans])
+            _shadow_cache_put(key, att_grid)
         
         # Apply to each per-label RSSI grid belonging to this TX
         for lbl in labels:
@@ -313,24 +518,32 @@ def _apply_obstacle_shadows(result, config, device_info):
                 result.rssi[lbl] -= att_grid
             if lbl in result.snr:
                 result.snr[lbl] -= att_grid
+        for lbl in dict.fromkeys(labels):
+            if last_tx[lbl] != i:
+                continue
+            if lbl in result.rssi:
+                best_rssi = _fold_max(best_rssi, result.rssi[lbl])
+            if lbl in result.snr:
+                best_snr = _fold_max(best_snr, result.snr[lbl])
     
-    # Recompute best_rssi from the now-attenuated per-TX grids
-    if result.rssi:
-        all_rssi = list(result.rssi.values())
-        result.best_rssi = np.maximum.reduce(all_rssi)
-    if result.snr:
-        all_snr = list(result.snr.values())
-        result.best_snr = np.maximum.reduce(all_snr)
+    if best_rssi is not None:
+        result.best_rssi = best_rssi
+    if best_snr is not None:
+        result.best_snr = best_snr
 
 
 def run_simulation(config: SimConfig) -> Dict:
     width_m = config.width_km * 1000
     height_m = config.height_km * 1000
     
-    env = Environment(width=width_m, height=height_m, resolution=config.resolution_m)
+    # Post-processing and stats only need ~0.1 dB precision: float32 grids
+    # move half the bytes through the simulation and every later pass
+    env = Environment(width=width_m, height=height_m, resolution=config.resolution_m,
+                      dtype=np.float32)
     
-    for obs in config.obstacles:
-        for seg in rect_to_obstacle_segments(obs):
+    obs_rects = obstacle_rects(config.obstacles)
+    for obs, rect in zip(config.obstacles, obs_rects):
+        for seg in rect_to_obstacle_segments(rect, obs.material):
             env.add_obstacle(seg)
     
     device_info = []  # (freq_mhz, bw_khz, x_m, y_m, tx_power, tech_key)
@@ -347,15 +560,23 @@ def run_simulation(config: SimConfig) -> Dict:
         "power_meter": 0,
     }
     
-    for dev in config.devices:
+    # For the per-tech stats: label -> tech (first device wins when labels
+    # collide) and the highest spreading factor seen per tech
+    label_to_tech: Dict[str, str] = {}
+    tech_max_sf: Dict[str, int] = {}
+    
+    h_gains = height_gains_db([dev.get("elevation_m", 1.0) for dev in config.devices])
+    
+    for dev, h_gain in zip(config.devices, h_gains.tolist()):
         x_m = dev["position"]["x"] * 1000
         y_m = dev["position"]["y"] * 1000
         dtype = dev.get("type", "")
         label = dev.get("label", dtype)
-        elevation_m = dev.get("elevation_m", 1.0)
-        h_gain = height_gain_db(elevation_m)
         
         counts[dtype] = counts.get(dtype, 0) + 1
+        tech = dtype.split("_")[0]
+        label_to_tech.setdefault(dev.get("label", ""), tech)
+        tech_max_sf[tech] = max(tech_max_sf.get(tech, 12), dev.get("spreading_factor", 12))
         
         if dtype == "power_meter":
             # Power meter is purely a noise source, not a transmitter
@@ -436,18 +657,22 @@ def run_simulation(config: SimConfig) -> Dict:
             env.add_transmitter(tx)
             device_info.append((proto.frequency_mhz, proto.bandwidth_khz, x_m, y_m, tx_power, "nbiot"))
     
-    # Inter-device interference
-    for i, (f1, bw1, x1, y1, pwr1, tech1) in enumerate(device_info):
-        for j, (f2, bw2, x2, y2, pwr2, tech2) in enumerate(device_info):
-            if i == j:
-                continue
-            if tech1 == "power_meter" or tech2 == "power_meter":
-                continue  # power meters already added as noise sources
-            if freqs_overlap(f1, bw1, f2, bw2):
-                ns = NoiseSource(x=x1, y=y1, power_dbm=pwr1 - 10,
-                               frequency_mhz=f1, bandwidth_khz=bw1,
-                               label=f"interf_{i}_{j}")
-                env.add_noise_source(ns)
+    # Inter-device interference: each overlapping pair (i, j) contributes an
+    # identical source at device i. Sources sharing a position and channel
+    # (per pair, and across co-located devices) are merged into one with
+    # their powers summed in mW.
+    n_overlaps = _interferer_counts(device_info)
+    # (x, y, freq, bw) -> (first device index, total mW)
+    interferers: Dict[Tuple[float, float, float, float], Tuple[int, float]] = {}
+    for i in np.flatnonzero(n_overlaps).tolist():
+        f1, bw1, x1, y1, pwr1, _ = device_info[i]
+        first, p_mw = interferers.get((x1, y1, f1, bw1), (i, 0.0))
+        interferers[(x1, y1, f1, bw1)] = (first, p_mw + n_overlaps[i] * 10.0 ** ((pwr1 - 10) / 10.0))
+    for (x1, y1, f1, bw1), (i, p_mw) in interferers.items():
+        ns = NoiseSource(x=x1, y=y1, power_dbm=10.0 * math.log10(p_mw),
+                       frequency_mhz=f1, bandwidth_khz=bw1,
+                       label=f"interf_{i}")
+        env.add_noise_source(ns)
     
     # Run simulation
     pl_exp = ENV_PATH_LOSS_EXPONENT.get(config.environment_type, 2.7)
@@ -462,7 +687,7 @@ def run_simulation(config: SimConfig) -> Dict:
     result = sim.run()
     
     # ── Post-process: apply obstacle shadow attenuation to RSSI grid ──
-    _apply_obstacle_shadows(result, config, device_info)
+    _apply_obstacle_shadows(result, obs_rects, config, device_info)
     
     # Overall coverage stats (use worst-case sensitivity across all techs present)
     stats = sim.coverage_stats(result, sensitivity_dbm=-137.0)
@@ -470,68 +695,148 @@ def run_simulation(config: SimConfig) -> Dict:
     # Per-tech stats: compute from per-transmitter RSSI/SNR
     per_tech_stats = {}
     
-    for tech in ["halow", "lorawan", "nbiot"]:
-        tech_rssi_arrays = []
-        tech_snr_arrays = []
-        for label_key, rssi_grid in result.rssi.items():
-            # Match by label prefix
-            for dev in config.devices:
-                if dev.get("label", "") == label_key:
-                    dk = dev.get("type", "")
-                    if dk.startswith(tech):
-                        tech_rssi_arrays.append(rssi_grid)
-                        if label_key in result.snr:
-                            tech_snr_arrays.append(result.snr[label_key])
-                    break
+    # Stack per-transmitter grids grouped by tech; one reduceat pass then
+    # yields every tech's best RSSI/SNR (every RSSI label has an SNR grid)
+    tech_labels: Dict[str, List[str]] = {"halow": [], "lorawan": [], "nbiot": []}
+    for label_key in result.rssi:
+        tech = label_to_tech.get(label_key)
+        if tech in tech_labels:
+            tech_labels[tech].append(label_key)
+    present = [tech for tech, labels in tech_labels.items() if labels]
+    if present:
+        ordered = [lbl for tech in present for lbl in tech_labels[tech]]
+        offsets = np.cumsum([0] + [len(tech_labels[tech]) for tech in present[:-1]])
+        tech_best_rssi = np.maximum.reduceat(
+            np.stack([result.rssi[lbl] for lbl in ordered]), offsets, axis=0)
+        tech_best_snr = np.maximum.reduceat(
+            np.stack([result.snr[lbl] for lbl in ordered]), offsets, axis=0)
         
-        if tech_rssi_arrays:
-            best_rssi = np.maximum.reduce(tech_rssi_arrays)
-            best_snr = np.maximum.reduce(tech_snr_arrays) if tech_snr_arrays else np.zeros_like(best_rssi)
-            # Per-tech sensitivity (for LoRaWAN, use worst SF present or default SF12)
+        # Per-tech sensitivity (for LoRaWAN, use worst SF present or default SF12)
+        sens = np.empty(len(present))
+        for k, tech in enumerate(present):
             tech_sens = TECH_SENSITIVITY.get(tech, -137.0)
             if isinstance(tech_sens, dict):
-                # Find max SF used by this tech's devices
-                max_sf = 12
-                for dev in config.devices:
-                    if dev.get("type", "").startswith(tech):
-                        max_sf = max(max_sf, dev.get("spreading_factor", 12))
-                sens = tech_sens.get(max_sf, -137.0)
+                sens[k] = tech_sens.get(tech_max_sf.get(tech, 12), -137.0)
             else:
-                sens = tech_sens
-            total = best_rssi.size
-            covered = int(np.sum(best_rssi >= sens))
+                sens[k] = tech_sens
+        
+        # Coverage and means for every tech in one reduction over the stack
+        total = tech_best_rssi[0].size
+        covered = np.count_nonzero(tech_best_rssi >= sens[:, None, None], axis=(1, 2))
+        mean_rssi = tech_best_rssi.mean(axis=(1, 2))
+        mean_snr = tech_best_snr.mean(axis=(1, 2))
+        for k, tech in enumerate(present):
             per_tech_stats[tech] = {
-                "coverage_pct": round(100.0 * covered / total, 2) if total else 0.0,
-                "mean_rssi_dbm": round(float(np.mean(best_rssi)), 2),
-                "mean_snr_db": round(float(np.mean(best_snr)), 2),
+                "coverage_pct": round(100.0 * int(covered[k]) / total, 2) if total else 0.0,
+                "mean_rssi_dbm": round(float(mean_rssi[k]), 2),
+                "mean_snr_db": round(float(mean_snr[k]), 2),
             }
     
     return {
         "width_km": config.width_km,
         "height_km": config.height_km,
         "resolution_m": config.resolution_m,
-        "rssi_grid": result.best_rssi.tolist(),
-        "snr_grid": result.best_snr.tolist(),
-        "interference_grid": result.interference.tolist(),
+        "rssi_grid": quantize_grid(result.best_rssi, **GRID_ENCODING["rssi"]),
+        "snr_grid": quantize_grid(result.best_snr, **GRID_ENCODING["snr"]),
+        "interference_grid": quantize_grid(result.interference, **GRID_ENCODING["interference"]),
+        "grid_encoding": GRID_ENCODING,
         "grid_shape": list(result.best_rssi.shape),
         "stats": stats,
         "per_tech_stats": per_tech_stats,
         "device_counts": counts,
     }
 
+# ============================================================================
+# Result cache: identical configs (e.g. UI re-renders) skip the simulation.
+# A hit replays the same fading realization as the original run.
+# ============================================================================
+SIM_CACHE_MAX_ENTRIES = 32
+SIM_CACHE_MAX_BYTES = 128 * 1024 * 1024
+_sim_cache: "OrderedDict[str, Dict]" = OrderedDict()
+_sim_cache_lock = threading.Lock()  # simulations run in worker threads
+
+GRID_KINDS = ("rssi", "snr", "interference")
+
+def _config_key(config: SimConfig) -> str:
+    """Cache key, also the handle clients use to fetch a result's grids."""
+    blob = orjson.dumps(config.model_dump(), option=orjson.OPT_SORT_KEYS)
+    return hashlib.blake2b(blob, digest_size=16).hexdigest()
+
+def _result_nbytes(result: Dict) -> int:
+    return sum(v.nbytes for v in result.values() if isinstance(v, np.ndarray))
+
+def run_simulation_cached(config: SimConfig) -> Tuple[str, Dict]:
+    key = _config_key(config)
+    with _sim_cache_lock:
+        if key in _sim_cache:
+            _sim_cache.move_to_end(key)
+            return key, _sim_cache[key]
+    result = run_simulation(config)
+    with _sim_cache_lock:
+        _sim_cache[key] = result
+        total = sum(_result_nbytes(r) for r in _sim_cache.values())
+        while len(_sim_cache) > 1 and (
+            len(_sim_cache) > SIM_CACHE_MAX_ENTRIES or total > SIM_CACHE_MAX_BYTES
+        ):
+            _, evicted = _sim_cache.popitem(last=False)
+            total -= _result_nbytes(evicted)
+    return key, result
+
 # ============================================================================
 # API endpoints
 # ============================================================================
 
-@app.post("/api/simulate")
-async def simulate(config: SimConfig):
+# The body is parsed by hand in simulate(), so its schema is declared
+# explicitly; the nested models go into the document's components.
+_SIM_CONFIG_SCHEMA = SimConfig.model_json_schema(ref_template="#/components/schemas/{model}")
+_SIM_CONFIG_DEFS = _SIM_CONFIG_SCHEMA.pop("$defs", {})
+
+@app.post("/api/simulate", openapi_extra={"requestBody": {
+    "required": True,
+    "content": {"application/json": {"schema": {"$ref": "#/components/schemas/SimConfig"}}},
+}})
+async def simulate(request: Request):
+    # Validate straight from the raw body in pydantic-core instead of letting
+    # FastAPI build and walk an intermediate dict first
+    try:
+        config = SimConfig.model_validate_json(await request.body())
+    except ValidationError as e:
+        # Same error contract as a declared body parameter: locations under "body"
+        raise RequestValidationError(
+            [{**err, "loc": ("body", *err["loc"])} for err in e.errors()]
+        )
     try:
-        result = run_simulation(config)
-        return {"ok": True, "result": result}
+        # CPU-bound: run off the event loop so other requests stay responsive
+        handle, result = await asyncio.to_thread(run_simulation_cached, config)
+        # Grids are fetched separately from /api/simulate/grid/{handle}/{kind}
+        summary = {k: v for k, v in result.items() if not isinstance(v, np.ndarray)}
+        summary["handle"] = handle
+        return NumpyJSONResponse({"ok": True, "result": summary})
     except Exception as e:
         import traceback
         return {"ok": False, "error": str(e), "trace": traceback.format_exc()}
 
+@app.get("/api/simulate/grid/{handle}/{kind}")
+async def simulate_grid(handle: str, kind: str):
+    """Raw uint8 grid bytes (row-major); decode with value = q * scale + offset."""
+    if kind not in GRID_KINDS:
+        raise HTTPException(status_code=404, detail=f"Unknown grid kind: {kind}")
+    with _sim_cache_lock:
+        result = _sim_cache.get(handle)
+    if result is None:
+        raise HTTPException(status_code=404, detail="Simulation result expired")
+    grid = result[f"{kind}_grid"]
+    enc = GRID_ENCODING[kind]
+    return Response(
+        content=grid.tobytes(),
+        media_type="application/octet-stream",
+        headers={
+            "X-Shape": f"{grid.shape[0]}x{grid.shape[1]}",
+            "X-Scale": str(enc["scale"]),
+            "X-Offset": str(enc["offset"]),
+        },
+    )
+
 @app.get("/api/halow-channels")
 async def halow_channels():
     return HALOW_US_CHANNELS
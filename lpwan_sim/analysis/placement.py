@@ -2,12 +2,12 @@
 
 from __future__ import annotations
 
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 
 import numpy as np
 
 from ..core.environment import Environment
-from ..core.device import Gateway
+from ..core.device import Gateway, Transmitter
 from ..core.simulation import Simulation
 from ..protocols.base import Protocol
 
@@ -16,6 +16,51 @@ from ..protocols.base import Protocol
 # Coverage score
 # ------------------------------------------------------------------
 
+def _virtual_transmitter(gw: Gateway) -> Transmitter:
+    """Treat a gateway as a transmitter at its protocol's maximum power."""
+    return Transmitter(
+        x=gw.x, y=gw.y, protocol=gw.protocol,
+        tx_power_dbm=gw.protocol.max_tx_power_dbm,
+        antenna_gain_dbi=gw.antenna_gain_dbi,
+    )
+
+
+# Upper bound on grid cells per candidate batch (~2 MB of float64 per tensor,
+# small enough to stay cache-resident through the path-loss and reduction passes)
+_BATCH_CELLS = 1 << 18
+
+
+def _iter_candidate_rssi(
+    sim: Simulation, tx: Transmitter, cand_x: np.ndarray, cand_y: np.ndarray,
+):
+    """Yield ``(start, rssi)`` blocks of candidate RSSI grids, shape ``(k, ny, nx)``.
+
+    Each candidate position is evaluated as *tx* moved to that position,
+    batched over candidates so the distance and path-loss passes are a
+    few array operations per block instead of one Simulation per
+    candidate. Values match :meth:`Simulation.transmitter_rssi` (without
+    fading).
+    """
+    env = sim.env
+    ny, nx = env.shape
+    batch = max(1, _BATCH_CELLS // (ny * nx))
+    for start in range(0, cand_x.size, batch):
+        bx = cand_x[start:start + batch]
+        by = cand_y[start:start + batch]
+        dist = np.add(
+            ((env.ys - by[:, None]) ** 2)[:, :, None],
+            ((env.xs - bx[:, None]) ** 2)[:, None, :],
+            dtype=env.dtype,
+        )
+        np.sqrt(dist, out=dist)
+        np.maximum(dist, env.resolution, out=dist)
+        pl = sim.path_loss(dist, tx.protocol.frequency_mhz, out=dist)
+        if env.obstacles:
+            for k in range(bx.size):
+                pl[k] += env.obstacle_attenuation_view(bx[k], by[k])
+        yield start, np.subtract(tx.eirp_dbm, pl, out=pl)
+
+
 def coverage_score(
     env: Environment,
     gateways: List[Gateway],
@@ -26,46 +71,43 @@ def coverage_score(
     w_coverage: float = 1.0,
     w_mean_snr: float = 0.1,
     w_min_snr: float = 0.05,
+    cached_best_rssi: Optional[np.ndarray] = None,
+    cached_interference: Optional[np.ndarray] = None,
 ) -> float:
     """Compute a weighted coverage score for a set of gateways.
 
     Score = w_coverage * coverage_pct + w_mean_snr * mean_snr + w_min_snr * min_snr
-    """
-    saved_gw = list(env.gateways)
-    env.gateways = list(gateways)
-
-    # We need at least one transmitter to produce RSSI; use gateways as
-    # "virtual transmitters" for coverage evaluation.
-    from ..core.device import Transmitter
-    virtual_txs = []
-    for gw in gateways:
-        virtual_txs.append(Transmitter(
-            x=gw.x, y=gw.y, protocol=gw.protocol,
-            tx_power_dbm=gw.protocol.max_tx_power_dbm,
-            antenna_gain_dbi=gw.antenna_gain_dbi,
-        ))
-
-    saved_tx = list(env.transmitters)
-    env.transmitters = virtual_txs
 
+    Gateways are evaluated as "virtual transmitters". For incremental
+    searches, *cached_best_rssi* is the best-RSSI grid of gateways already
+    placed (so only *gateways* need computing) and *cached_interference*
+    the interference grid (dBm), which does not depend on the gateways.
+    """
     sim = Simulation(env, pathloss_model=pathloss_model,
                      pathloss_exponent=pathloss_exponent,
                      noise_floor_dbm=noise_floor_dbm)
-    res = sim.run()
-    stats = sim.coverage_stats(res, sensitivity_dbm=sensitivity_dbm)
+    result = sim.run_fast(
+        [_virtual_transmitter(gw) for gw in gateways],
+        best_rssi=cached_best_rssi,
+        interference=cached_interference,
+    )
 
-    cov_pct = stats["coverage_pct"]
-    mean_snr = stats["mean_snr_db"]
-    min_snr = float(np.min(res.best_snr))
+    return _weighted_score(
+        *sim.coverage_metrics(result.best_rssi, result.best_snr, sensitivity_dbm),
+        w_coverage=w_coverage, w_mean_snr=w_mean_snr, w_min_snr=w_min_snr,
+    )
 
-    env.gateways = saved_gw
-    env.transmitters = saved_tx
 
-    return w_coverage * cov_pct + w_mean_snr * mean_snr + w_min_snr * min_snr
+def _weighted_score(
+    cov_pct: float, mean_snr: float, min_snr: float,
+    w_coverage: float, w_mean_snr: float, w_min_snr: float,
+) -> float:
+    """Weighted score from raw metrics; coverage and mean SNR count at 0.01 precision."""
+    return w_coverage * round(cov_pct, 2) + w_mean_snr * round(mean_snr, 2) + w_min_snr * min_snr
 
 
 # ------------------------------------------------------------------
-# Legacy brute-force (kept for backwards compat)
+# Legacy single-gateway search (kept for backwards compat)
 # ------------------------------------------------------------------
 
 def suggest_gateway_position(
@@ -73,26 +115,44 @@ def suggest_gateway_position(
     protocol: Protocol,
     sensitivity_dbm: float = -137.0,
     step: float | None = None,
+    coarse_factor: int = 4,
 ) -> Tuple[float, float, float]:
-    """Brute-force search for the gateway position that maximises coverage.
+    """Coarse-to-fine search for the gateway position that maximises coverage.
+
+    Each candidate is scored by the coverage of the gateway itself, seen as
+    a virtual transmitter at the protocol's maximum power. Candidates are
+    first scanned every ``coarse_factor * step``; the ``step`` grid is then
+    searched only within one coarse step of the best coarse candidate.
+    ``coarse_factor=1`` is the exhaustive scan.
 
     Returns ``(best_x, best_y, coverage_pct)``.
     """
     step = step or env.resolution * 5
+    coarse_step = step * max(1, coarse_factor)
     best: Tuple[float, float, float] = (0.0, 0.0, 0.0)
-
-    for cx in np.arange(0, env.width, step):
-        for cy in np.arange(0, env.height, step):
-            gw = Gateway(x=float(cx), y=float(cy), protocol=protocol, sensitivity_dbm=sensitivity_dbm)
-            env_copy_gw = list(env.gateways)
-            env.gateways = [gw]
-            sim = Simulation(env)
-            res = sim.run()
-            stats = sim.coverage_stats(res, sensitivity_dbm=sensitivity_dbm)
-            env.gateways = env_copy_gw
-
-            if stats["coverage_pct"] > best[2]:
-                best = (float(cx), float(cy), stats["coverage_pct"])
+    sim = Simulation(env)
+    tx = _virtual_transmitter(Gateway(x=0.0, y=0.0, protocol=protocol, sensitivity_dbm=sensitivity_dbm))
+    total = env.grid_x.size
+
+    def _scan(xs, ys, best):
+        cand_x, cand_y = (a.ravel() for a in np.meshgrid(xs, ys, indexing="ij"))
+        covered = np.empty(cand_x.size, dtype=np.int64)
+        for start, rssi in _iter_candidate_rssi(sim, tx, cand_x, cand_y):
+            covered[start:start + len(rssi)] = np.count_nonzero(rssi >= sensitivity_dbm, axis=(1, 2))
+        for cx, cy, n in zip(cand_x, cand_y, covered):
+            pct = round(100.0 * int(n) / total, 2)
+            if pct > best[2]:
+                best = (float(cx), float(cy), pct)
+        return best
+
+    best = _scan(np.arange(0, env.width, coarse_step), np.arange(0, env.height, coarse_step), best)
+    if coarse_step > step:
+        bx, by, _ = best
+        best = _scan(
+            np.arange(max(0.0, bx - coarse_step), min(env.width, bx + coarse_step), step),
+            np.arange(max(0.0, by - coarse_step), min(env.height, by + coarse_step), step),
+            best,
+        )
 
     return best
 
@@ -101,6 +161,18 @@ def suggest_gateway_position(
 # Gradient-based / hill-climb placement
 # ------------------------------------------------------------------
 
+def _halton(n: int, base: int) -> np.ndarray:
+    """First *n* points (skipping 0) of the van der Corput sequence in *base*, in [0, 1)."""
+    idx = np.arange(1, n + 1)
+    out = np.zeros(n)
+    scale = 1.0
+    while idx.any():
+        scale /= base
+        out += scale * (idx % base)
+        idx //= base
+    return out
+
+
 def suggest_gateway_positions(
     env: Environment,
     protocol: Protocol,
@@ -115,8 +187,19 @@ def suggest_gateway_positions(
     w_coverage: float = 1.0,
     w_mean_snr: float = 0.1,
     w_min_snr: float = 0.05,
+    n_coarse_candidates: int | None = None,
 ) -> List[Dict]:
-    """Suggest positions for *n_gateways* using coarse grid search + hill-climb refinement.
+    """Suggest positions for *n_gateways* using coarse grid search + nested-grid refinement.
+
+    If *n_coarse_candidates* is given, the coarse stage scores that many
+    points of a 2-D Halton sequence over the area instead of the
+    ``coarse_step`` grid; the low-discrepancy points cover the area evenly
+    with far fewer scores than a dense grid on large areas.
+
+    Around the best coarse candidate, a 5x5 pattern spaced ``fine_radius / 2``
+    is scored and re-centred on the best point, halving the spacing each
+    level down to ``fine_step``. This needs ~24 scores per level instead of
+    ``(2 * fine_radius / fine_step) ** 2`` for a dense fine scan.
 
     Returns a list of dicts sorted by score (best first):
     ``[{"rank": 1, "x": ..., "y": ..., "score": ...}, ...]``
@@ -125,57 +208,88 @@ def suggest_gateway_positions(
     fine_step = fine_step or env.resolution
     fine_radius = fine_radius or coarse_step
 
-    placed: List[Gateway] = []
     suggestions: List[Dict] = []
 
-    score_kwargs = dict(
-        pathloss_model=pathloss_model,
-        pathloss_exponent=pathloss_exponent,
-        noise_floor_dbm=noise_floor_dbm,
-        sensitivity_dbm=sensitivity_dbm,
-        w_coverage=w_coverage,
-        w_mean_snr=w_mean_snr,
-        w_min_snr=w_min_snr,
-    )
+    # Interference does not depend on gateway placement, and the best RSSI
+    # of the gateways placed so far is folded once per placed gateway, so
+    # each candidate only costs its own RSSI grid.
+    sim = Simulation(env, pathloss_model=pathloss_model,
+                     pathloss_exponent=pathloss_exponent,
+                     noise_floor_dbm=noise_floor_dbm)
+    tx = _virtual_transmitter(Gateway(x=0.0, y=0.0, protocol=protocol, sensitivity_dbm=sensitivity_dbm))
+    snr_offset = sim.interference_grid() + sim.noise_figure_db
+    placed_best_rssi: Optional[np.ndarray] = None
+    total = env.grid_x.size
+
+    def _best_of(cand_x, cand_y, best_score, best_pos):
+        """Score candidates in batches (as coverage_score would) and keep the first best."""
+        if not cand_x.size:
+            return best_score, best_pos
+        covered = np.empty(cand_x.size, dtype=np.int64)
+        mean_snr = np.empty(cand_x.size)
+        min_snr = np.empty(cand_x.size)
+        for start, rssi in _iter_candidate_rssi(sim, tx, cand_x, cand_y):
+            stop = start + len(rssi)
+            if placed_best_rssi is not None:
+                np.maximum(rssi, placed_best_rssi, out=rssi)
+            covered[start:stop] = np.count_nonzero(rssi >= sensitivity_dbm, axis=(1, 2))
+            snr = np.subtract(rssi, snr_offset, out=rssi)
+            mean_snr[start:stop] = snr.mean(axis=(1, 2))
+            min_snr[start:stop] = snr.min(axis=(1, 2))
+        for k in range(cand_x.size):
+            score = _weighted_score(
+                100.0 * int(covered[k]) / total, float(mean_snr[k]), float(min_snr[k]),
+                w_coverage=w_coverage, w_mean_snr=w_mean_snr, w_min_snr=w_min_snr,
+            )
+            if score > best_score:
+                best_score = score
+                best_pos = (float(cand_x[k]), float(cand_y[k]))
+        return best_score, best_pos
 
     for gw_idx in range(n_gateways):
         # --- Coarse grid search ---
-        best_pos = (0.0, 0.0)
-        best_score = -np.inf
-
-        for cx in np.arange(0, env.width, coarse_step):
-            for cy in np.arange(0, env.height, coarse_step):
-                candidate = Gateway(
-                    x=float(cx), y=float(cy), protocol=protocol,
-                    sensitivity_dbm=sensitivity_dbm,
-                )
-                score = coverage_score(env, placed + [candidate], **score_kwargs)
-                if score > best_score:
-                    best_score = score
-                    best_pos = (float(cx), float(cy))
-
-        # --- Hill-climb refinement ---
-        cx, cy = best_pos
-        for fx in np.arange(
-            max(0, cx - fine_radius), min(env.width, cx + fine_radius), fine_step
-        ):
-            for fy in np.arange(
-                max(0, cy - fine_radius), min(env.height, cy + fine_radius), fine_step
-            ):
-                candidate = Gateway(
-                    x=float(fx), y=float(fy), protocol=protocol,
-                    sensitivity_dbm=sensitivity_dbm,
-                )
-                score = coverage_score(env, placed + [candidate], **score_kwargs)
-                if score > best_score:
-                    best_score = score
-                    best_pos = (float(fx), float(fy))
+        if n_coarse_candidates is not None:
+            cand_x = _halton(n_coarse_candidates, 2) * env.width
+            cand_y = _halton(n_coarse_candidates, 3) * env.height
+        else:
+            cand_x, cand_y = (a.ravel() for a in np.meshgrid(
+                np.arange(0, env.width, coarse_step),
+                np.arange(0, env.height, coarse_step),
+                indexing="ij",
+            ))
+        best_score, best_pos = _best_of(cand_x, cand_y, -np.inf, (0.0, 0.0))
+
+        # --- Nested-grid refinement ---
+        # Score a 5x5 pattern around the current best, then halve its
+        # spacing; the last level is scanned at exactly fine_step.
+        spacing = fine_radius / 2.0
+        while True:
+            spacing = max(spacing, fine_step)
+            cx, cy = best_pos
+            cand_x, cand_y = (a.ravel() for a in np.meshgrid(
+                cx + spacing * np.arange(-2, 3),
+                cy + spacing * np.arange(-2, 3),
+                indexing="ij",
+            ))
+            keep = (
+                ((cand_x != cx) | (cand_y != cy))
+                & (cand_x >= 0) & (cand_x < env.width)
+                & (cand_y >= 0) & (cand_y < env.height)
+            )
+            best_score, best_pos = _best_of(cand_x[keep], cand_y[keep], best_score, best_pos)
+            if spacing <= fine_step:
+                break
+            spacing /= 2.0
 
         final_gw = Gateway(
             x=best_pos[0], y=best_pos[1], protocol=protocol,
             sensitivity_dbm=sensitivity_dbm,
         )
-        placed.append(final_gw)
+        final_rssi = sim.transmitter_rssi(_virtual_transmitter(final_gw))
+        placed_best_rssi = (
+            final_rssi if placed_best_rssi is None
+            else np.maximum(placed_best_rssi, final_rssi)
+        )
         suggestions.append({
             "rank": gw_idx + 1,
             "x": best_pos[0],
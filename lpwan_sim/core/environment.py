@@ -10,6 +10,9 @@ import numpy as np
 from .device import Gateway, NoiseSource, Transmitter
 
 
+# Memory budget for an Environment's memoised obstacle-attenuation grids
+OBSTACLE_GRID_CACHE_BYTES = 64 * 1024 * 1024
+
 # ---------------------------------------------------------------------------
 # Material presets: material name → attenuation in dB
 # ---------------------------------------------------------------------------
@@ -113,12 +116,13 @@ def segments_intersect(
     d3 = _cross(p1, p2, p3)
     d4 = _cross(p1, p2, p4)
 
-    if ((d1 > 0 and d2 < 0) or (d1 < 0 and d2 > 0)) and (
-        (d3 > 0 and d4 < 0) or (d3 < 0 and d4 > 0)
-    ):
+    # Proper crossing: strict sign change on both segments
+    if d1 * d2 < 0.0 and d3 * d4 < 0.0:
         return True
+    if d1 and d2 and d3 and d4:
+        return False
 
-    # Collinear / on-segment checks
+    # Collinear / on-segment checks (only reached when some d is zero)
     def _on_segment(o: Tuple[float, float], a: Tuple[float, float], b: Tuple[float, float]) -> bool:
         return min(o[0], b[0]) <= a[0] <= max(o[0], b[0]) and min(o[1], b[1]) <= a[1] <= max(o[1], b[1])
 
@@ -133,6 +137,24 @@ def segments_intersect(
     return False
 
 
+def _in_box(px, py, ax, ay, bx, by):
+    """Vectorized bounding-box test: does (px, py) lie within the box spanned by a and b?"""
+    return (
+        (np.minimum(ax, bx) <= px) & (px <= np.maximum(ax, bx))
+        & (np.minimum(ay, by) <= py) & (py <= np.maximum(ay, by))
+    )
+
+
+def _obstacle_spans(
+    coords: np.ndarray, src: float, a: np.ndarray, b: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Per-obstacle index ranges of sorted *coords* whose ray from *src* overlaps [a, b] on this axis."""
+    lo, hi = np.minimum(a, b), np.maximum(a, b)
+    start = np.where(src < lo, np.searchsorted(coords, lo, side="left"), 0)
+    stop = np.where(src > hi, np.searchsorted(coords, hi, side="right"), coords.size)
+    return start, stop
+
+
 class Environment:
     """2-D simulation area with configurable resolution.
 
@@ -144,12 +166,24 @@ class Environment:
         Height of the area in metres.
     resolution : float
         Grid cell size in metres (default 1 m).
+    dtype : numpy dtype
+        Floating-point type of the coordinate grids and of every grid
+        computed from them (default ``float64``). ``float32`` halves memory
+        traffic and is ample for coverage work; the 1-D axes and obstacle
+        orientation tests always stay in float64.
     """
 
-    def __init__(self, width: float, height: float, resolution: float = 1.0) -> None:
+    def __init__(
+        self,
+        width: float,
+        height: float,
+        resolution: float = 1.0,
+        dtype: np.typing.DTypeLike = np.float64,
+    ) -> None:
         self.width = width
         self.height = height
         self.resolution = resolution
+        self.dtype = np.dtype(dtype)
 
         self.transmitters: List[Transmitter] = []
         self.gateways: List[Gateway] = []
@@ -157,12 +191,23 @@ class Environment:
         self.walls: List[Wall] = []
         self.obstacles: List[Obstacle] = []
 
+        # Obstacle grids memoised per source position; the version is bumped
+        # by add_obstacle() so stale grids are never served
+        self._obs_version = 0
+        self._obs_grid_cache: Dict[Tuple[float, float, int], np.ndarray] = {}
+        self._obs_grid_cache_bytes = 0
+        self._obs_arrays: Optional[Tuple[np.ndarray, ...]] = None
+        self._obs_segments: np.ndarray = np.empty((0, 2, 2))
+        self._obs_arrays_version = -1
+
         # Grid coordinate arrays (metres)
-        self.xs: np.ndarray = np.arange(0, width, resolution)
-        self.ys: np.ndarray = np.arange(0, height, resolution)
+        self.xs: np.ndarray = np.arange(0, width, resolution, dtype=np.float64)
+        self.ys: np.ndarray = np.arange(0, height, resolution, dtype=np.float64)
         self.grid_x: np.ndarray
         self.grid_y: np.ndarray
-        self.grid_x, self.grid_y = np.meshgrid(self.xs, self.ys)
+        self.grid_x, self.grid_y = np.meshgrid(
+            self.xs.astype(self.dtype, copy=False), self.ys.astype(self.dtype, copy=False)
+        )
 
     # ------------------------------------------------------------------
     # Placement helpers
@@ -183,6 +228,11 @@ class Environment:
     def add_obstacle(self, obstacle: Obstacle) -> None:
         """Add an :class:`Obstacle` to the environment."""
         self.obstacles.append(obstacle)
+        self._obs_version += 1
+        self._obs_grid_cache.clear()
+        self._obs_grid_cache_bytes = 0
+        self._obs_arrays = None
+        self._obs_arrays_version = -1
 
     # ------------------------------------------------------------------
     # Obstacle / intersection helpers
@@ -201,26 +251,146 @@ class Environment:
     def obstacle_attenuation_grid(self, x: float, y: float) -> np.ndarray:
         """Return grid of cumulative obstacle attenuation (dB) from point (x, y) to every cell.
 
-        .. note::
-            This is O(cells × obstacles) — fine for moderate grid sizes.
+        The grid is the caller's own; see :meth:`obstacle_attenuation_view`
+        for the shared, memoised one.
+        """
+        return self.obstacle_attenuation_view(x, y).copy()
+
+    def obstacle_attenuation_view(self, x: float, y: float) -> np.ndarray:
+        """Read-only obstacle attenuation grid (dB) from (x, y), shared between calls.
+
+        Grids are memoised per ``(x, y)``, so transmitters sharing a
+        position and placement candidates revisited across gateways are
+        computed once; callers must not modify the result (it is flagged
+        read-only). Add obstacles through :meth:`add_obstacle`, which
+        invalidates the memo.
+
+        Once :data:`OBSTACLE_GRID_CACHE_BYTES` is used up, new positions are
+        computed but not stored: a candidate sweep larger than the budget
+        then still hits on the part that fits, where an LRU would evict
+        every grid just before the sweep comes back to it.
         """
-        att = np.zeros(self.shape, dtype=np.float64)
         if not self.obstacles:
+            return np.zeros(self.shape, dtype=self.dtype)
+        key = (float(x), float(y), self._obs_version)
+        cache = self._obs_grid_cache
+        att = cache.get(key)
+        if att is not None:
+            return att
+
+        att = self._compute_obstacle_grid(x, y)
+        att.setflags(write=False)
+        if self._obs_grid_cache_bytes + att.nbytes <= OBSTACLE_GRID_CACHE_BYTES:
+            cache[key] = att
+            self._obs_grid_cache_bytes += att.nbytes
+        return att
+
+    def _compute_obstacle_grid(self, x: float, y: float) -> np.ndarray:
+        """Obstacle attenuation grid from (x, y), uncached.
+
+        Evaluates the orientation tests of :func:`segments_intersect`
+        (including its collinear / touching cases) for all cells at once.
+        Every cross product is separable into a row term and a column term,
+        so per obstacle only 1-D vectors are computed and each ``d`` grid is
+        a single broadcast subtraction into a reused scratch buffer.
+
+        A ray can only touch an obstacle if their bounding boxes overlap,
+        which holds on a contiguous block of rows and columns; the tests
+        are restricted to that block (see :func:`_obstacle_spans`).
+        """
+        att = np.zeros(self.shape, dtype=self.dtype)
+        xs = self.xs
+        ys = self.ys
+        ox1, oy1, ox2, oy2, oatt = self.obstacle_arrays
+        c0s, c1s = _obstacle_spans(xs, x, ox1, ox2)
+        r0s, r1s = _obstacle_spans(ys, y, oy1, oy2)
+        live = np.flatnonzero((c0s < c1s) & (r0s < r1s))
+        if not live.size:
             return att
-        for i in range(att.shape[0]):
-            for j in range(att.shape[1]):
-                gx = float(self.grid_x[i, j])
-                gy = float(self.grid_y[i, j])
-                att[i, j] = self.obstacle_attenuation(x, y, gx, gy)
+        scratch = np.empty((4, att.size))
+        mask = np.empty((2, att.size), dtype=bool)
+        rows = np.column_stack((ox1, oy1, ox2, oy2, oatt, c0s, c1s, r0s, r1s))[live].tolist()
+        for x3, y3, x4, y4, att_db, c0, c1, r0, r1 in rows:
+            c0, c1, r0, r1 = int(c0), int(c1), int(r0), int(r1)
+            bx = xs[c0:c1]
+            by = ys[r0:r1, None]
+            block = (r1 - r0, c1 - c0)
+            n = block[0] * block[1]
+            d2, d3, d4, prod = (buf[:n].reshape(block) for buf in scratch)
+            hit, tmp = (buf[:n].reshape(block) for buf in mask)
+            dx = bx - x
+            dy = by - y
+
+            # Orientation of source (d1) and cells (d2) w.r.t. the obstacle,
+            # and of the obstacle ends (d3, d4) w.r.t. each source->cell ray
+            d1 = (x4 - x3) * (y - y3) - (y4 - y3) * (x - x3)
+            np.subtract((x4 - x3) * (by - y3), (y4 - y3) * (bx - x3), out=d2)
+            np.subtract(dx * (y3 - y), dy * (x3 - x), out=d3)
+            np.subtract(dx * (y4 - y), dy * (x4 - x), out=d4)
+
+            # Proper crossing: strict sign change on both segments
+            if d1 > 0:
+                np.less(d2, 0, out=hit)
+            elif d1 < 0:
+                np.greater(d2, 0, out=hit)
+            else:
+                hit.fill(False)
+            if hit.any():
+                hit &= np.less(np.multiply(d3, d4, out=prod), 0, out=tmp)
+
+            # Collinear / on-segment cases
+            if d1 == 0.0 and min(x3, x4) <= x <= max(x3, x4) and min(y3, y4) <= y <= max(y3, y4):
+                hit.fill(True)
+            hit |= (d2 == 0.0) & _in_box(bx, by, x3, y3, x4, y4)
+            hit |= (d3 == 0.0) & _in_box(x3, y3, x, y, bx, by)
+            hit |= (d4 == 0.0) & _in_box(x4, y4, x, y, bx, by)
+            att[r0:r1, c0:c1][hit] += att_db
         return att
 
+    @property
+    def obstacle_arrays(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Obstacles as contiguous float64 arrays ``(x1, y1, x2, y2, attenuation_db)``.
+
+        Rebuilt lazily after :meth:`add_obstacle`, so vectorized code gets the
+        endpoints without walking the :class:`Obstacle` list on every call.
+        """
+        self._refresh_obstacle_arrays()
+        return self._obs_arrays  # type: ignore[return-value]
+
+    @property
+    def obstacle_segments(self) -> np.ndarray:
+        """Obstacle endpoints as a contiguous ``(N, 2, 2)`` float64 array.
+
+        ``segments[i] == [start_point, end_point]``; the layout
+        :class:`~matplotlib.collections.LineCollection` takes directly.
+        """
+        self._refresh_obstacle_arrays()
+        return self._obs_segments
+
+    def _refresh_obstacle_arrays(self) -> None:
+        if self._obs_arrays_version == self._obs_version:
+            return
+        table = np.array(
+            [(*o.start_point, *o.end_point, o.attenuation_db) for o in self.obstacles],
+            dtype=np.float64,
+        ).reshape(-1, 5)
+        self._obs_arrays = tuple(np.ascontiguousarray(col) for col in table.T)
+        self._obs_segments = table[:, :4].reshape(-1, 2, 2).copy()
+        self._obs_arrays_version = self._obs_version
+
     # ------------------------------------------------------------------
     # Utility
     # ------------------------------------------------------------------
 
     def distance_grid(self, x: float, y: float) -> np.ndarray:
-        """Return array of distances (m) from point (x, y) to every grid cell."""
-        return np.sqrt((self.grid_x - x) ** 2 + (self.grid_y - y) ** 2).clip(min=self.resolution)
+        """Return array of distances (m) from point (x, y) to every grid cell.
+
+        The squared offsets are separable, so they are formed on the 1-D
+        axes and only the sum, ``sqrt`` and clip touch the full grid (in place).
+        """
+        dist = np.add(((self.ys - y) ** 2)[:, None], (self.xs - x) ** 2, dtype=self.dtype)
+        np.sqrt(dist, out=dist)
+        return np.maximum(dist, self.resolution, out=dist)
 
     @property
     def shape(self) -> tuple[int, int]:
@@ -3,13 +3,14 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Dict, List
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
 
 import numpy as np
 
 from .device import Gateway, NoiseSource, Transmitter
 from .environment import Environment
-from ..propagation.pathloss import free_space_path_loss, log_distance_path_loss
+from ..propagation.pathloss import compute_rssi_grid, free_space_path_loss, log_distance_path_loss
 from ..propagation.interference import noise_power_dbm
 
 
@@ -28,6 +29,14 @@ class SimulationResult:
     best_snr: np.ndarray = field(default_factory=lambda: np.array([]))
 
 
+def _max_of(grids: List[np.ndarray]) -> np.ndarray:
+    """Elementwise max of *grids*, folded in place into one copy (no stacked temporary)."""
+    best = grids[0].copy()
+    for grid in grids[1:]:
+        np.maximum(best, grid, out=best)
+    return best
+
+
 class Simulation:
     """Compute RSSI, interference, and SNR over an :class:`Environment`.
 
@@ -61,11 +70,82 @@ class Simulation:
         self.multipath_fading = multipath_fading
         self.noise_figure_db = noise_figure_db
 
+        # The model is fixed for the simulation: resolve it once here
+        # rather than on every transmitter / noise source
+        self._pl_func: Callable[..., Any]
+        if pathloss_model == "fspl":
+            self._pl_func = free_space_path_loss
+        else:
+            self._pl_func = partial(log_distance_path_loss, n=pathloss_exponent)
+
+    # ------------------------------------------------------------------
+    def path_loss(
+        self, distance: np.ndarray, freq_mhz: float, out: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """Path loss (dB) over *distance* (m) under this simulation's model.
+
+        Written to *out* when given; it may be *distance* itself.
+        """
+        return self._pl_func(distance, freq_mhz, out=out)
+
     # ------------------------------------------------------------------
-    def _path_loss(self, distance: np.ndarray, freq_mhz: float) -> np.ndarray:
-        if self.pathloss_model == "fspl":
-            return free_space_path_loss(distance, freq_mhz)
-        return log_distance_path_loss(distance, freq_mhz, n=self.pathloss_exponent)
+    def transmitter_rssi(self, tx: Transmitter) -> np.ndarray:
+        """RSSI grid (dBm) for a single transmitter, including obstacles and fading.
+
+        The distance grid is the only full-size allocation kept: path loss is
+        written over it, then obstacle attenuation, EIRP and fading terms are
+        applied in place.
+        """
+        env = self.env
+        dist = env.distance_grid(tx.x, tx.y)
+        obstacle_db = env.obstacle_attenuation_view(tx.x, tx.y) if env.obstacles else None
+        rssi = compute_rssi_grid(
+            dist, tx.protocol.frequency_mhz, tx.eirp_dbm, obstacle_db, out=dist, model=self._pl_func,
+        )
+
+        # Shadow fading (log-normal)
+        if self.shadow_fading_std > 0:
+            rssi += np.random.normal(0, self.shadow_fading_std, rssi.shape)
+
+        # Multipath fading (Rayleigh)
+        if self.multipath_fading:
+            x_mp = np.random.normal(0, 1, rssi.shape)
+            y_mp = np.random.normal(0, 1, rssi.shape)
+            r = np.square(x_mp, out=x_mp)
+            r += np.square(y_mp, out=y_mp)
+            np.sqrt(r, out=r)
+            r /= np.sqrt(2)
+            fading_db = np.log10(np.clip(r, 0.01, None, out=r), out=r)
+            fading_db *= 20.0
+            rssi += fading_db
+
+        return rssi
+
+    def interference_grid(self) -> np.ndarray:
+        """Total interference power (dBm): all noise sources plus the thermal floor.
+
+        Each source's path-loss grid is turned into received mW in place,
+        so the sum costs one grid per source rather than four.
+        """
+        env = self.env
+        interf_mw = np.zeros(env.shape, dtype=env.dtype)
+        for ns in env.noise_sources:
+            dist = env.distance_grid(ns.x, ns.y)
+            pl = self.path_loss(dist, ns.frequency_mhz, out=dist)
+
+            # Add obstacle attenuation for noise sources too
+            if env.obstacles:
+                pl += env.obstacle_attenuation_view(ns.x, ns.y)
+
+            power = np.subtract(ns.power_dbm, pl, out=pl)  # received interference dBm
+            power /= 10.0
+            interf_mw += np.power(10.0, power, out=power)
+
+        # Add thermal noise floor
+        interf_mw += 10.0 ** (self.noise_floor_dbm / 10.0)
+        np.log10(interf_mw, out=interf_mw)
+        interf_mw *= 10.0
+        return interf_mw
 
     # ------------------------------------------------------------------
     def run(self) -> SimulationResult:
@@ -76,54 +156,18 @@ class Simulation:
         # --- RSSI per transmitter ---
         rssi_stack: List[np.ndarray] = []
         for idx, tx in enumerate(env.transmitters):
-            dist = env.distance_grid(tx.x, tx.y)
-            freq = tx.protocol.frequency_mhz
-            pl = self._path_loss(dist, freq)
-
-            # Add obstacle attenuation
-            obs_att = env.obstacle_attenuation_grid(tx.x, tx.y)
-            pl = pl + obs_att
-
-            rssi = tx.eirp_dbm - pl
-
-            # Shadow fading (log-normal)
-            if self.shadow_fading_std > 0:
-                fading = np.random.normal(0, self.shadow_fading_std, rssi.shape)
-                rssi = rssi + fading
-
-            # Multipath fading (Rayleigh)
-            if self.multipath_fading:
-                x_mp = np.random.normal(0, 1, rssi.shape)
-                y_mp = np.random.normal(0, 1, rssi.shape)
-                r = np.sqrt(x_mp**2 + y_mp**2) / np.sqrt(2)
-                fading_db = 20.0 * np.log10(np.clip(r, 0.01, None))
-                rssi = rssi + fading_db
-
+            rssi = self.transmitter_rssi(tx)
             label = tx.label or f"tx_{idx}"
             result.rssi[label] = rssi
             rssi_stack.append(rssi)
 
         if rssi_stack:
-            result.best_rssi = np.maximum.reduce(rssi_stack)
+            result.best_rssi = _max_of(rssi_stack)
         else:
-            result.best_rssi = np.full(env.shape, self.noise_floor_dbm)
+            result.best_rssi = np.full(env.shape, self.noise_floor_dbm, dtype=env.dtype)
 
         # --- Interference ---
-        interf_mw = np.zeros(env.shape)
-        for ns in env.noise_sources:
-            dist = env.distance_grid(ns.x, ns.y)
-            pl = self._path_loss(dist, ns.frequency_mhz)
-
-            # Add obstacle attenuation for noise sources too
-            obs_att = env.obstacle_attenuation_grid(ns.x, ns.y)
-            pl = pl + obs_att
-
-            power = ns.power_dbm - pl  # received interference dBm
-            interf_mw += 10.0 ** (power / 10.0)
-
-        # Add thermal noise floor
-        interf_mw += 10.0 ** (self.noise_floor_dbm / 10.0)
-        result.interference = 10.0 * np.log10(interf_mw)
+        result.interference = self.interference_grid()
 
         # --- SNR per transmitter ---
         snr_stack: List[np.ndarray] = []
@@ -133,10 +177,51 @@ class Simulation:
             snr_stack.append(snr)
 
         if snr_stack:
-            result.best_snr = np.maximum.reduce(snr_stack)
+            result.best_snr = _max_of(snr_stack)
         else:
-            result.best_snr = np.zeros(env.shape)
+            result.best_snr = np.zeros(env.shape, dtype=env.dtype)
+
+        return result
+
+    def run_fast(
+        self,
+        transmitters: Optional[Sequence[Transmitter]] = None,
+        best_rssi: Optional[np.ndarray] = None,
+        interference: Optional[np.ndarray] = None,
+    ) -> SimulationResult:
+        """Like :meth:`run`, but only fill ``best_rssi``, ``interference`` and ``best_snr``.
+
+        Per-transmitter RSSI grids are folded into ``best_rssi`` as they are
+        computed and never stored, and no per-label SNR grids are built:
+        every SNR grid subtracts the same interference, so ``best_snr``
+        follows from ``best_rssi`` directly (with identical values).
+
+        Parameters
+        ----------
+        transmitters : sequence of Transmitter, optional
+            Transmitters to evaluate instead of ``env.transmitters``.
+        best_rssi : ndarray, optional
+            Best RSSI of transmitters already evaluated, folded in as the
+            starting grid (it is not modified).
+        interference : ndarray, optional
+            Precomputed :meth:`interference_grid`.
+        """
+        env = self.env
+        result = SimulationResult()
+
+        if transmitters is None:
+            transmitters = env.transmitters
+        for tx in transmitters:
+            rssi = self.transmitter_rssi(tx)
+            best_rssi = rssi if best_rssi is None else np.maximum(best_rssi, rssi, out=rssi)
 
+        result.interference = self.interference_grid() if interference is None else interference
+        if best_rssi is None:
+            result.best_rssi = np.full(env.shape, self.noise_floor_dbm, dtype=env.dtype)
+            result.best_snr = np.zeros(env.shape, dtype=env.dtype)
+        else:
+            result.best_rssi = best_rssi
+            result.best_snr = best_rssi - (result.interference + self.noise_figure_db)
         return result
 
     # ------------------------------------------------------------------
@@ -153,3 +238,15 @@ class Simulation:
             "mean_rssi_dbm": round(float(np.mean(result.best_rssi)), 2),
             "mean_snr_db": round(float(np.mean(result.best_snr)), 2),
         }
+
+    def coverage_metrics(
+        self, best_rssi: np.ndarray, best_snr: np.ndarray, sensitivity_dbm: float = -137.0
+    ) -> Tuple[float, float, float]:
+        """Return ``(coverage_pct, mean_snr_db, min_snr_db)`` without building a dict or rounding."""
+        total = best_rssi.size
+        covered = int(np.count_nonzero(best_rssi >= sensitivity_dbm))
+        return (
+            100.0 * covered / total if total else 0.0,
+            float(np.mean(best_snr)),
+            float(np.min(best_snr)),
+        )
@@ -1,4 +1,7 @@
-from .pathloss import free_space_path_loss, log_distance_path_loss, okumura_hata
+from .pathloss import (
+    compute_rssi_grid, free_space_path_loss, log_distance_path_loss, okumura_hata, okumura_hata_all,
+)
 from .interference import noise_power_dbm
 
-__all__ = ["free_space_path_loss", "log_distance_path_loss", "okumura_hata", "noise_power_dbm"]
+__all__ = ["free_space_path_loss", "log_distance_path_loss", "okumura_hata", "okumura_hata_all",
+           "compute_rssi_grid", "noise_power_dbm"]
@@ -2,18 +2,77 @@
 
 from __future__ import annotations
 
+import math
+from functools import lru_cache
+from typing import Any, Callable, Dict, Optional, overload
+
 import numpy as np
 
 
-def free_space_path_loss(distance_m: np.ndarray | float, freq_mhz: float) -> np.ndarray:
+def _as_float(distance_m: np.ndarray | float) -> np.ndarray:
+    """View *distance_m* as a float array: float32 grids stay float32, anything else is float64."""
+    d = np.asarray(distance_m)
+    return d if d.dtype == np.float32 else d.astype(np.float64, copy=False)
+
+
+def _buffer(a: np.ndarray | float) -> np.ndarray | None:
+    """*a* if it is a fresh array the caller may overwrite via ``out=``, else ``None`` (scalars)."""
+    return a if isinstance(a, np.ndarray) else None
+
+
+def _prepare_distance(
+    distance_m: np.ndarray | float,
+    unit: float,
+    floor: float,
+    out: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """``max(distance_m / unit, floor)`` in *out*, or a single fresh buffer the model may overwrite."""
+    d = _as_float(distance_m)
+    if unit != 1.0:
+        d = np.divide(d, unit, out=out)
+        return np.maximum(d, floor, out=_buffer(d))
+    return np.maximum(d, floor, out=out)
+
+
+@overload
+def free_space_path_loss(distance_m: float, freq_mhz: float, out: Optional[np.ndarray] = ...) -> float: ...
+@overload
+def free_space_path_loss(distance_m: np.ndarray, freq_mhz: float, out: Optional[np.ndarray] = ...) -> np.ndarray: ...
+
+
+def free_space_path_loss(
+    distance_m: np.ndarray | float,
+    freq_mhz: float,
+    out: Optional[np.ndarray] = None,
+) -> np.ndarray | float:
     """Free-Space Path Loss (Friis).
 
     FSPL(dB) = 20·log10(d) + 20·log10(f) + 32.44
     where *d* in km, *f* in MHz.
+
+    Plain Python numbers (here and in the other models) are evaluated with
+    :mod:`math` rather than dispatched through NumPy as 0-d arrays.  Grids
+    are written to *out* when given -- it may be *distance_m* itself, for
+    callers that own the distance grid -- instead of a fresh array.
     """
-    d_km = np.asarray(distance_m, dtype=np.float64) / 1000.0
-    d_km = np.clip(d_km, 1e-6, None)
-    return 20.0 * np.log10(d_km) + 20.0 * np.log10(freq_mhz) + 32.44  # type: ignore[return-value]
+    if isinstance(distance_m, (int, float)):
+        km = max(distance_m / 1000.0, 1e-6)
+        return 20.0 * math.log10(km) + (20.0 * math.log10(freq_mhz) + 32.44)
+    d_km = _prepare_distance(distance_m, 1000.0, 1e-6, out)
+    pl = np.log10(d_km, out=_buffer(d_km))
+    pl *= 20.0
+    pl += 20.0 * math.log10(freq_mhz) + 32.44
+    return pl
+
+
+@overload
+def log_distance_path_loss(
+    distance_m: float, freq_mhz: float, n: float = ..., d0: float = ..., out: Optional[np.ndarray] = ...
+) -> float: ...
+@overload
+def log_distance_path_loss(
+    distance_m: np.ndarray, freq_mhz: float, n: float = ..., d0: float = ..., out: Optional[np.ndarray] = ...
+) -> np.ndarray: ...
 
 
 def log_distance_path_loss(
@@ -21,17 +80,61 @@ def log_distance_path_loss(
     freq_mhz: float,
     n: float = 2.7,
     d0: float = 1.0,
-) -> np.ndarray:
+    out: Optional[np.ndarray] = None,
+) -> np.ndarray | float:
     """Log-distance path-loss model.
 
     PL(d) = PL(d0) + 10·n·log10(d/d0)
 
-    PL(d0) is computed via FSPL at reference distance *d0*.
+    PL(d0) is computed via FSPL at reference distance *d0* (once per
+    ``(freq_mhz, d0)``, see :func:`_reference_loss`).
     """
-    pl0 = float(free_space_path_loss(d0, freq_mhz))
-    d = np.asarray(distance_m, dtype=np.float64)
-    d = np.clip(d, d0, None)
-    return pl0 + 10.0 * n * np.log10(d / d0)  # type: ignore[return-value]
+    pl0 = _reference_loss(freq_mhz, d0)
+    if isinstance(distance_m, (int, float)):
+        return math.log10(max(distance_m, d0) / d0) * (10.0 * n) + pl0
+    d = _prepare_distance(distance_m, d0, 1.0, out)
+    pl = np.log10(d, out=_buffer(d))
+    pl *= 10.0 * n
+    pl += pl0
+    return pl
+
+
+@lru_cache(maxsize=64)
+def _reference_loss(freq_mhz: float, d0: float) -> float:
+    """FSPL (dB) at reference distance *d0*; scenarios use only a handful of frequencies."""
+    return free_space_path_loss(float(d0), freq_mhz)
+
+
+def _okumura_hata_terms(freq_mhz: float, h_bs: float, h_ms: float, area: str) -> tuple[float, float]:
+    """``(intercept, slope)`` such that PL = intercept + slope·log10(d_km).
+
+    Everything except the distance term is a scalar, so it is folded into
+    one intercept and the grid sees a single log10 and a multiply-add.
+    """
+    lf = math.log10(freq_mhz)
+    lhbs = math.log10(h_bs)
+
+    # Correction factor for mobile antenna height (medium-small city)
+    a_hm = (1.1 * lf - 0.7) * h_ms - (1.56 * lf - 0.8)
+
+    intercept = 69.55 + 26.16 * lf - 13.82 * lhbs - a_hm
+    if area == "suburban":
+        intercept -= 2.0 * math.log10(freq_mhz / 28.0) ** 2 + 5.4
+    elif area == "rural":
+        intercept -= 4.78 * lf ** 2 - 18.33 * lf + 40.94
+    return intercept, 44.9 - 6.55 * lhbs
+
+
+@overload
+def okumura_hata(
+    distance_m: float, freq_mhz: float, h_bs: float = ..., h_ms: float = ..., area: str = ...,
+    out: Optional[np.ndarray] = ...,
+) -> float: ...
+@overload
+def okumura_hata(
+    distance_m: np.ndarray, freq_mhz: float, h_bs: float = ..., h_ms: float = ..., area: str = ...,
+    out: Optional[np.ndarray] = ...,
+) -> np.ndarray: ...
 
 
 def okumura_hata(
@@ -40,7 +143,8 @@ def okumura_hata(
     h_bs: float = 30.0,
     h_ms: float = 1.5,
     area: str = "urban",
-) -> np.ndarray:
+    out: Optional[np.ndarray] = None,
+) -> np.ndarray | float:
     """Okumura-Hata path-loss model (150–1500 MHz, 1–20 km).
 
     Parameters
@@ -49,23 +153,77 @@ def okumura_hata(
     h_ms : float  Mobile-station antenna height (m).
     area : str    ``"urban"`` | ``"suburban"`` | ``"rural"``.
     """
-    f = freq_mhz
-    d_km = np.asarray(distance_m, dtype=np.float64) / 1000.0
-    d_km = np.clip(d_km, 0.01, None)
+    intercept, slope = _okumura_hata_terms(freq_mhz, h_bs, h_ms, area)
+    if isinstance(distance_m, (int, float)):
+        return math.log10(max(distance_m / 1000.0, 0.01)) * slope + intercept
 
-    # Correction factor for mobile antenna height (medium-small city)
-    a_hm = (1.1 * np.log10(f) - 0.7) * h_ms - (1.56 * np.log10(f) - 0.8)
+    d_km = _prepare_distance(distance_m, 1000.0, 0.01, out)
+    pl = np.log10(d_km, out=_buffer(d_km))
+    pl *= slope
+    pl += intercept
+    return pl
 
-    L_urban = (
-        69.55
-        + 26.16 * np.log10(f)
-        - 13.82 * np.log10(h_bs)
-        - a_hm
-        + (44.9 - 6.55 * np.log10(h_bs)) * np.log10(d_km)
-    )
 
-    if area == "suburban":
-        return L_urban - 2.0 * (np.log10(f / 28.0)) ** 2 - 5.4  # type: ignore[return-value]
-    if area == "rural":
-        return L_urban - 4.78 * (np.log10(f)) ** 2 + 18.33 * np.log10(f) - 40.94  # type: ignore[return-value]
-    return L_urban  # type: ignore[return-value]
+OKUMURA_HATA_AREAS = ("urban", "suburban", "rural")
+
+
+def okumura_hata_all(
+    distance_m: np.ndarray | float,
+    freq_mhz: float,
+    h_bs: float = 30.0,
+    h_ms: float = 1.5,
+) -> Dict[str, np.ndarray]:
+    """Okumura-Hata path loss for every area type, keyed by area.
+
+    The areas differ only in their scalar intercept, so ``log10(d_km)`` is
+    evaluated once and shared; each entry equals
+    ``okumura_hata(distance_m, freq_mhz, h_bs, h_ms, area)``.
+    """
+    log_d = np.log10(_prepare_distance(distance_m, 1000.0, 0.01))
+    out: Dict[str, np.ndarray] = {}
+    for area in OKUMURA_HATA_AREAS:
+        intercept, slope = _okumura_hata_terms(freq_mhz, h_bs, h_ms, area)
+        pl = log_d * slope
+        pl += intercept
+        out[area] = pl
+    return out
+
+
+@overload
+def compute_rssi_grid(
+    distance_m: np.ndarray, freq_mhz: float, tx_power_dbm: float, obstacle_db: Optional[np.ndarray] = ...,
+    out: Optional[np.ndarray] = ..., model: Callable[..., Any] = ...,
+) -> np.ndarray: ...
+@overload
+def compute_rssi_grid(
+    distance_m: float, freq_mhz: float, tx_power_dbm: float, obstacle_db: None = ...,
+    out: Optional[np.ndarray] = ..., model: Callable[..., Any] = ...,
+) -> float: ...
+@overload
+def compute_rssi_grid(
+    distance_m: float, freq_mhz: float, tx_power_dbm: float, obstacle_db: np.ndarray,
+    out: Optional[np.ndarray] = ..., model: Callable[..., Any] = ...,
+) -> np.ndarray: ...
+
+
+def compute_rssi_grid(
+    distance_m: np.ndarray | float,
+    freq_mhz: float,
+    tx_power_dbm: float,
+    obstacle_db: Optional[np.ndarray] = None,
+    out: Optional[np.ndarray] = None,
+    model: Callable[..., Any] = free_space_path_loss,
+) -> np.ndarray | float:
+    """Received power (dBm) over a distance grid.
+
+    ``tx_power_dbm - PL(d) - obstacle_db``, evaluated in a single buffer
+    (*out*, which may be *distance_m*, or one fresh array) rather than as
+    separate path-loss, attenuation and RSSI grids.  *model* is one of the
+    path-loss functions here (free space by default), with any parameters
+    beyond ``(distance_m, freq_mhz, out=)`` already bound.  A scalar
+    distance gives a scalar, as with the models themselves.
+    """
+    pl = model(distance_m, freq_mhz, out=out)
+    if obstacle_db is not None:
+        pl = np.add(pl, obstacle_db, out=_buffer(pl))
+    return np.subtract(tx_power_dbm, pl, out=_buffer(pl))
@@ -17,6 +17,15 @@ BAND_FREQ: Dict[str, float] = {
     "B28": 758.0,
 }
 
+# Occupied bandwidth (kHz) per tone mode
+TONE_BANDWIDTH: Dict[str, float] = {
+    "single-3.75": 3.75,
+    "single-15": 15.0,
+    "multi-3": 45.0,
+    "multi-6": 90.0,
+    "multi-12": 180.0,
+}
+
 
 @dataclass
 class NBIoT(Protocol):
@@ -38,11 +47,4 @@ class NBIoT(Protocol):
 
     def __post_init__(self) -> None:
         self.frequency_mhz = BAND_FREQ.get(self.band, 791.0)
-        bw_map = {
-            "single-3.75": 3.75,
-            "single-15": 15.0,
-            "multi-3": 45.0,
-            "multi-6": 90.0,
-            "multi-12": 180.0,
-        }
-        self.bandwidth_khz = bw_map.get(self.tone_mode, 15.0)
+        self.bandwidth_khz = TONE_BANDWIDTH.get(self.tone_mode, 15.0)
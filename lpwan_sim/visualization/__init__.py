@@ -1,9 +1,11 @@
 from .heatmap import (
     plot_rssi, plot_snr, plot_interference,
     plot_coverage_overlay, plot_comparison, plot_placement_suggestions,
+    save_raw_png, HeatmapRenderer,
 )
 
 __all__ = [
     "plot_rssi", "plot_snr", "plot_interference",
     "plot_coverage_overlay", "plot_comparison", "plot_placement_suggestions",
+    "save_raw_png", "HeatmapRenderer",
 ]
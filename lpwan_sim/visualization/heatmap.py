@@ -7,23 +7,60 @@ from typing import Dict, List, Optional, Sequence, Tuple
 
 import matplotlib.pyplot as plt
 import numpy as np
+from matplotlib import image as mimage
+from matplotlib.axes import Axes
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import LineCollection
+from matplotlib.figure import Figure
 
 from ..core.environment import Environment
 from ..core.simulation import SimulationResult
 
 
+# Beyond this many obstacles the material labels only add clutter (and
+# one text artist each), so the rest are drawn unlabelled.
+_MAX_OBSTACLE_LABELS = 200
+
+# Resolution figures are saved at.
+_DPI = 150
+
+# Grids smaller than this are handed to ``imshow`` untouched.
+_DOWNSAMPLE_MIN_CELLS = 1_000_000
+
+
 # ------------------------------------------------------------------
 # Internal helpers
 # ------------------------------------------------------------------
 
-def _draw_obstacles(ax: plt.Axes, env: Environment) -> None:  # type: ignore[name-defined]
-    """Draw obstacle line segments and label them with material name."""
-    for obs in env.obstacles:
-        x1, y1 = obs.start_point
-        x2, y2 = obs.end_point
-        ax.plot([x1, x2], [y1, y2], linewidth=2.5, color="white", linestyle="-")
-        ax.plot([x1, x2], [y1, y2], linewidth=1.5, color="black", linestyle="--")
-        mx, my = (x1 + x2) / 2, (y1 + y2) / 2
+def _new_figure(figsize: Tuple[float, float], detached: bool = False) -> Figure:
+    """Create a figure through pyplot, or with *detached* on a bare Agg canvas.
+
+    A detached figure is not registered with pyplot's figure manager, so
+    ``plt.show()`` does not display it, but it is freed with its last
+    reference instead of staying alive until ``plt.close``.
+    """
+    if not detached:
+        return plt.figure(figsize=figsize)
+    fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)
+    return fig
+
+
+def _draw_obstacles(ax: Axes, env: Environment) -> None:
+    """Draw obstacle line segments and label them with material name.
+
+    All segments go into one :class:`~matplotlib.collections.LineCollection`
+    per stroke style, so the artist count does not grow with the obstacle
+    count; labels are capped at ``_MAX_OBSTACLE_LABELS``.
+    """
+    if not env.obstacles:
+        return
+    segs = env.obstacle_segments
+    lines = list(segs)  # LineCollection is typed to take a sequence of segments
+    ax.add_collection(LineCollection(lines, linewidths=2.5, colors="white", linestyles="-", zorder=2))
+    ax.add_collection(LineCollection(lines, linewidths=1.5, colors="black", linestyles="--", zorder=2))
+    mids = segs[:_MAX_OBSTACLE_LABELS].mean(axis=1).tolist()
+    for obs, (mx, my) in zip(env.obstacles, mids):
         ax.annotate(
             obs.material,
             (mx, my),
@@ -36,13 +73,52 @@ def _draw_obstacles(ax: plt.Axes, env: Environment) -> None:  # type: ignore[nam
         )
 
 
-def _annotate_devices(ax: plt.Axes, env: Environment) -> None:  # type: ignore[name-defined]
-    for tx in env.transmitters:
-        ax.plot(tx.x, tx.y, "^", color="lime", markersize=10, markeredgecolor="black", label=tx.label or "TX")
-    for gw in env.gateways:
-        ax.plot(gw.x, gw.y, "s", color="cyan", markersize=12, markeredgecolor="black", label=gw.label or "GW")
-    for ns in env.noise_sources:
-        ax.plot(ns.x, ns.y, "x", color="red", markersize=10, markeredgewidth=3, label=ns.label or "Noise")
+def _downsample(data: np.ndarray, figsize: Tuple[float, float]) -> np.ndarray:
+    """Block-average *data* down to roughly the saved figure's pixel size.
+
+    ``imshow`` resamples the whole array on every draw, so grids much
+    larger than the output (more than 2x per axis) are reduced with an
+    integer-stride mean first.  The trimmed remainder is under one output
+    pixel, so the original ``extent`` still applies.  A NaN anywhere in a
+    block makes that whole output pixel NaN (blank).
+    """
+    if data.size < _DOWNSAMPLE_MIN_CELLS:
+        return data
+    rows, cols = data.shape
+    px_rows, px_cols = int(figsize[1] * _DPI), int(figsize[0] * _DPI)
+    sy = rows // px_rows if rows > 2 * px_rows else 1
+    sx = cols // px_cols if cols > 2 * px_cols else 1
+    if sy == 1 and sx == 1:
+        return data
+    ty, tx = rows // sy, cols // sx
+    return data[: ty * sy, : tx * sx].reshape(ty, sy, tx, sx).mean(axis=(1, 3))
+
+
+def _image_data(data: np.ndarray, figsize: Tuple[float, float]) -> np.ndarray:
+    """What ``imshow`` is given: *data* downsampled, with float64 narrowed to float32.
+
+    The image keeps its own masked copy of the array and normalises it
+    before colour mapping; at 8-bit output float32 loses nothing visible
+    and halves that copy.
+    """
+    data = _downsample(data, figsize)
+    return data.astype(np.float32) if data.dtype == np.float64 else data
+
+
+def _annotate_devices(ax: Axes, env: Environment) -> None:
+    """Mark devices with one scatter artist (and legend entry) per category."""
+    for devices, label, marker, color, size, edgecolor, linewidth in (
+        (env.transmitters, "TX", "^", "lime", 100, "black", 1.0),
+        (env.gateways, "GW", "s", "cyan", 144, "black", 1.0),
+        (env.noise_sources, "Noise", "x", "red", 100, None, 3.0),
+    ):
+        if not devices:
+            continue
+        xy = np.array([(d.x, d.y) for d in devices], dtype=np.float64)
+        ax.scatter(
+            xy[:, 0], xy[:, 1], s=size, c=color, marker=marker,
+            edgecolors=edgecolor, linewidths=linewidth, zorder=2, label=label,
+        )
 
 
 def _base_heatmap(
@@ -56,42 +132,147 @@ def _base_heatmap(
     save_path: Optional[str | Path] = None,
     figsize: tuple[int, int] = (10, 8),
     grid_lines: bool = False,
-) -> plt.Figure:  # type: ignore[name-defined]
-    fig, ax = plt.subplots(figsize=figsize)
-    extent = [0, env.width, 0, env.height]
-    im = ax.imshow(
-        data, origin="lower", extent=extent, cmap=cmap, aspect="auto", vmin=vmin, vmax=vmax
+    raw_only: bool = False,
+) -> Optional[Figure]:
+    if raw_only:
+        if not save_path:
+            raise ValueError("raw_only=True requires a save_path")
+        save_raw_png(data, save_path, cmap=cmap, vmin=vmin, vmax=vmax)
+        return None
+    renderer = HeatmapRenderer(
+        env, cmap=cmap, vmin=vmin, vmax=vmax, cbar_label=cbar_label,
+        figsize=figsize, grid_lines=grid_lines, detached=False,
     )
-    cbar = fig.colorbar(im, ax=ax)
-    cbar.set_label(cbar_label)
-    _draw_obstacles(ax, env)
-    _annotate_devices(ax, env)
-    ax.set_xlabel("X (m)")
-    ax.set_ylabel("Y (m)")
-    ax.set_title(title)
-    if grid_lines:
-        ax.grid(True, alpha=0.3, linestyle="--")
-    ax.legend(loc="upper right", fontsize=8)
-    fig.tight_layout()
-    if save_path:
-        fig.savefig(str(save_path), dpi=150)
-    return fig
+    return renderer.update(data, title=title, save_path=save_path)
 
 
 # ------------------------------------------------------------------
 # Public API
 # ------------------------------------------------------------------
 
+def save_raw_png(
+    data: np.ndarray,
+    path: str | Path,
+    cmap: str = "viridis",
+    vmin: Optional[float] = None,
+    vmax: Optional[float] = None,
+) -> None:
+    """Write *data* as a colour-mapped PNG, one pixel per grid cell.
+
+    No axes, colorbar, labels or overlays are drawn, so this skips the
+    figure layout and rasterisation entirely -- meant for batch sweeps
+    that only need the frames.  Row 0 is the bottom edge (``origin="lower"``),
+    as in the plotted heatmaps.
+    """
+    mimage.imsave(
+        str(path), data, cmap=cmap, vmin=vmin, vmax=vmax, origin="lower",
+        format="png", pil_kwargs={"compress_level": 1},
+    )
+
+
+class HeatmapRenderer:
+    """Heatmap figure over one environment, reused across many frames.
+
+    The axes, colorbar, obstacle and device artists and the legend are
+    built once; :meth:`update` only swaps the image data (and title), so
+    parameter sweeps that save a frame per run skip rebuilding the scene.
+
+    Parameters
+    ----------
+    env : Environment
+        Supplies the extent, obstacles and devices drawn under every frame.
+    cmap, vmin, vmax
+        Colour mapping.  A bound left as ``None`` follows each frame's own
+        minimum / maximum, as the ``plot_*`` functions do.
+    cbar_label : str
+        Colorbar label.
+    detached : bool
+        Build the figure outside pyplot (see :func:`_new_figure`), for
+        sweeps that only save frames and never call ``plt.show()``.
+    """
+
+    def __init__(
+        self,
+        env: Environment,
+        cmap: str = "inferno",
+        vmin: Optional[float] = None,
+        vmax: Optional[float] = None,
+        cbar_label: str = "",
+        figsize: tuple[int, int] = (10, 8),
+        grid_lines: bool = False,
+        detached: bool = True,
+    ) -> None:
+        self.env = env
+        self.grid_lines = grid_lines
+        self.figsize = figsize
+        self.vmin = vmin
+        self.vmax = vmax
+        self.fig = _new_figure(figsize, detached=detached)
+        self.ax = self.fig.subplots()
+        self.im = self.ax.imshow(
+            np.zeros((1, 1), dtype=np.float32), origin="lower",
+            extent=[0, env.width, 0, env.height], cmap=cmap, aspect="auto", vmin=vmin, vmax=vmax,
+        )
+        cbar = self.fig.colorbar(self.im, ax=self.ax)
+        cbar.set_label(cbar_label)
+        _draw_obstacles(self.ax, env)
+        _annotate_devices(self.ax, env)
+        self.ax.set_xlabel("X (m)")
+        self.ax.set_ylabel("Y (m)")
+        if grid_lines:
+            self.ax.grid(True, alpha=0.3, linestyle="--")
+        self.ax.legend(loc="upper right", fontsize=8)
+        self._laid_out = False
+
+    def update(
+        self,
+        data: np.ndarray,
+        title: Optional[str] = None,
+        save_path: Optional[str | Path] = None,
+    ) -> Figure:
+        """Show *data* (optionally retitled), save it if *save_path* is given, return the figure."""
+        self.im.set_data(_image_data(data, self.figsize))
+        # The norm was seeded from the placeholder image: keep the given
+        # bounds and take the missing ones from this frame (masked where
+        # not finite, as autoscale() would see it)
+        frame = self.im.get_array()
+        if frame is not None and (self.vmin is None or self.vmax is None):
+            self.im.set_clim(
+                frame.min() if self.vmin is None else self.vmin,
+                frame.max() if self.vmax is None else self.vmax,
+            )
+        if title is not None:
+            self.ax.set_title(title)
+        if not self._laid_out:
+            self.fig.tight_layout()
+            self._laid_out = True
+        if save_path:
+            self.fig.savefig(str(save_path), dpi=_DPI)
+        return self.fig
+
+
 def plot_rssi(
     result: SimulationResult,
     env: Environment,
     save_path: Optional[str | Path] = None,
     grid_lines: bool = False,
-) -> plt.Figure:  # type: ignore[name-defined]
-    """Plot best-RSSI heatmap."""
+    raw_only: bool = False,
+    renderer: Optional[HeatmapRenderer] = None,
+) -> Optional[Figure]:
+    """Plot best-RSSI heatmap.
+
+    ``raw_only=True`` writes just the grid to *save_path* via
+    :func:`save_raw_png` and returns ``None``.  Passing a *renderer* draws
+    into that :class:`HeatmapRenderer`'s figure instead of building a new one;
+    it must have been built for *env* and with the same *grid_lines*.
+    """
+    if renderer is not None and not raw_only:
+        if renderer.env is not env or renderer.grid_lines != grid_lines:
+            raise ValueError("renderer was built for a different env or grid_lines setting")
+        return renderer.update(result.best_rssi, title="RSSI Heatmap", save_path=save_path)
     return _base_heatmap(
         result.best_rssi, env, "RSSI Heatmap", "RSSI (dBm)",
-        cmap="inferno", save_path=save_path, grid_lines=grid_lines,
+        cmap="inferno", save_path=save_path, grid_lines=grid_lines, raw_only=raw_only,
     )
 
 
@@ -100,11 +281,16 @@ def plot_snr(
     env: Environment,
     save_path: Optional[str | Path] = None,
     grid_lines: bool = False,
-) -> plt.Figure:  # type: ignore[name-defined]
-    """Plot best-SNR heatmap."""
+    raw_only: bool = False,
+) -> Optional[Figure]:
+    """Plot best-SNR heatmap.
+
+    ``raw_only=True`` writes just the grid to *save_path* via
+    :func:`save_raw_png` and returns ``None``.
+    """
     return _base_heatmap(
         result.best_snr, env, "SNR Heatmap", "SNR (dB)",
-        cmap="RdYlGn", save_path=save_path, grid_lines=grid_lines,
+        cmap="RdYlGn", save_path=save_path, grid_lines=grid_lines, raw_only=raw_only,
     )
 
 
@@ -113,11 +299,16 @@ def plot_interference(
     env: Environment,
     save_path: Optional[str | Path] = None,
     grid_lines: bool = False,
-) -> plt.Figure:  # type: ignore[name-defined]
-    """Plot total interference heatmap."""
+    raw_only: bool = False,
+) -> Optional[Figure]:
+    """Plot total interference heatmap.
+
+    ``raw_only=True`` writes just the grid to *save_path* via
+    :func:`save_raw_png` and returns ``None``.
+    """
     return _base_heatmap(
         result.interference, env, "Interference Map", "Power (dBm)",
-        cmap="hot", save_path=save_path, grid_lines=grid_lines,
+        cmap="hot", save_path=save_path, grid_lines=grid_lines, raw_only=raw_only,
     )
 
 
@@ -127,13 +318,18 @@ def plot_coverage_overlay(
     sensitivity_dbm: float = -137.0,
     save_path: Optional[str | Path] = None,
     grid_lines: bool = False,
-) -> plt.Figure:  # type: ignore[name-defined]
-    """Binary covered / not-covered map with obstacles drawn."""
-    covered = (result.best_rssi >= sensitivity_dbm).astype(np.float64)
+    raw_only: bool = False,
+) -> Optional[Figure]:
+    """Binary covered / not-covered map with obstacles drawn.
+
+    ``raw_only=True`` writes just the grid to *save_path* via
+    :func:`save_raw_png` and returns ``None``.
+    """
+    covered = (result.best_rssi >= sensitivity_dbm).view(np.uint8)
     return _base_heatmap(
         covered, env, "Coverage Overlay", "Covered",
         cmap="RdYlGn", vmin=0, vmax=1,
-        save_path=save_path, grid_lines=grid_lines,
+        save_path=save_path, grid_lines=grid_lines, raw_only=raw_only,
     )
 
 
@@ -142,7 +338,7 @@ def plot_comparison(
     metric: str = "rssi",
     save_path: Optional[str | Path] = None,
     figsize: Optional[Tuple[int, int]] = None,
-) -> plt.Figure:  # type: ignore[name-defined]
+) -> Figure:
     """Side-by-side subplots comparing multiple protocols / scenarios.
 
     Parameters
@@ -155,7 +351,8 @@ def plot_comparison(
     n = len(results)
     if figsize is None:
         figsize = (6 * n, 5)
-    fig, axes = plt.subplots(1, n, figsize=figsize)
+    fig = _new_figure(figsize)
+    axes = fig.subplots(1, n)
     if n == 1:
         axes = [axes]
 
@@ -163,7 +360,8 @@ def plot_comparison(
     for ax, (label, (res, env)) in zip(axes, results.items()):
         data = res.best_rssi if metric == "rssi" else res.best_snr
         extent = [0, env.width, 0, env.height]
-        im = ax.imshow(data, origin="lower", extent=extent, cmap=cmap, aspect="auto")
+        im = ax.imshow(_image_data(data, (figsize[0] / n, figsize[1])), origin="lower",
+                       extent=extent, cmap=cmap, aspect="auto")
         fig.colorbar(im, ax=ax, fraction=0.046, pad=0.04)
         _draw_obstacles(ax, env)
         _annotate_devices(ax, env)
@@ -174,7 +372,7 @@ def plot_comparison(
     fig.suptitle(f"{metric.upper()} Comparison", fontsize=14)
     fig.tight_layout()
     if save_path:
-        fig.savefig(str(save_path), dpi=150)
+        fig.savefig(str(save_path), dpi=_DPI)
     return fig
 
 
@@ -183,7 +381,7 @@ def plot_placement_suggestions(
     suggestions: List[Dict],
     save_path: Optional[str | Path] = None,
     grid_lines: bool = False,
-) -> plt.Figure:  # type: ignore[name-defined]
+) -> Figure:
     """Show suggested gateway positions with scores on the environment.
 
     Parameters
@@ -191,11 +389,11 @@ def plot_placement_suggestions(
     suggestions : list of dict
         Each dict has keys ``"x"``, ``"y"``, ``"score"``, ``"rank"``.
     """
-    fig, ax = plt.subplots(figsize=(10, 8))
+    fig = _new_figure((10, 8))
+    ax = fig.subplots()
     extent = [0, env.width, 0, env.height]
-    # Light background
-    bg = np.ones(env.shape) * 0.9
-    ax.imshow(bg, origin="lower", extent=extent, cmap="gray", aspect="auto", vmin=0, vmax=1)
+    # Light background: a constant needs only one texel stretched over the extent
+    ax.imshow(np.full((1, 1), 0.9), origin="lower", extent=extent, cmap="gray", aspect="auto", vmin=0, vmax=1)
     _draw_obstacles(ax, env)
     _annotate_devices(ax, env)
 
@@ -220,5 +418,5 @@ def plot_placement_suggestions(
     ax.legend(loc="upper right", fontsize=8)
     fig.tight_layout()
     if save_path:
-        fig.savefig(str(save_path), dpi=150)
+        fig.savefig(str(save_path), dpi=_DPI)
     return fig
@@ -500,7 +500,7 @@ canvas.addEventListener('mousemove', e => {
         const row = Math.floor(km.y * 1000 / gridCfg.resolution_m);
         const col = Math.floor(km.x * 1000 / gridCfg.resolution_m);
         if (row >= 0 && row < rows && col >= 0 && col < cols) {
-            const rssi = rssi_grid[row][col];
+            const rssi = rssi_grid[row * cols + col];
             statusEl.textContent = `RSSI: ${rssi.toFixed(1)} dBm  |  Position: (${(km.x).toFixed(3)}km, ${(km.y).toFixed(3)}km)`;
         }
     }
@@ -597,6 +597,19 @@ function formatDistance(meters) {
 // ═══════════════════════════════════════════════════════════════════════
 let simActive = false;
 
+// Grids are fetched as raw uint8 bytes (row-major) from /api/simulate/grid;
+// value = q * scale + offset (see GRID_ENCODING in app.py)
+async function fetchGrid(handle, kind) {
+    const resp = await fetch(`/api/simulate/grid/${handle}/${kind}`);
+    if (!resp.ok) throw new Error(`Grid ${kind} unavailable (${resp.status})`);
+    const scale = parseFloat(resp.headers.get('X-Scale'));
+    const offset = parseFloat(resp.headers.get('X-Offset'));
+    const q = new Uint8Array(await resp.arrayBuffer());
+    const grid = new Float32Array(q.length);
+    for (let k = 0; k < q.length; k++) grid[k] = q[k] * scale + offset;
+    return grid;
+}
+
 async function runSimulation() {
     const filteredDevices = devices.filter(d => {
         if (d.type.startsWith('halow') && !showHalow) return false;
@@ -629,6 +642,10 @@ async function runSimulation() {
         });
         const data = await resp.json();
         if (data.ok) {
+            // Stats arrive first; the flat grids are fetched in parallel
+            const handle = data.result.handle;
+            [data.result.rssi_grid, data.result.snr_grid, data.result.interference_grid] =
+                await Promise.all(['rssi', 'snr', 'interference'].map(k => fetchGrid(handle, k)));
             heatmapData = data.result;
             heatmapCacheDirty = true;
             updateStats(data.result.stats);
@@ -737,7 +754,7 @@ function rebuildHeatmapCache() {
     for (let i = 0; i < rows; i++) {
         for (let j = 0; j < cols; j++) {
             const idx = (i * cols + j) * 4;
-            const rssi = rssi_grid[i][j];
+            const rssi = rssi_grid[i * cols + j];
             const c = rssiColorRGBA(rssi);
             d[idx] = c[0]; d[idx+1] = c[1]; d[idx+2] = c[2]; d[idx+3] = c[3];
         }
@@ -753,7 +770,7 @@ function rebuildHeatmapCache() {
         for (let i = 0; i < rows; i++) {
             for (let j = 0; j < cols; j++) {
                 const idx = (i * cols + j) * 4;
-                const interf = interference_grid[i][j];
+                const interf = interference_grid[i * cols + j];
                 if (interf > -120) {
                     const alpha = Math.min(0.6, Math.max(0.05, (interf + 120) / 80));
                     d2[idx] = 160; d2[idx+1] = 0; d2[idx+2] = 0; d2[idx+3] = Math.round(alpha * 255);
@@ -0,0 +1,310 @@
+"""Tests for the web app's simulation helpers."""
+
+import numpy as np
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("orjson")
+
+import app  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+
+@pytest.fixture
+def client():
+    return TestClient(app.app)
+
+
+def _ref_shadow(tx_x, tx_y, cell_xs, cell_ys, rects):
+    """Scalar per-cell reference: rays crossing an edge at 0.01 < t < 0.99
+    pay the attenuation once, cells inside an obstacle pay it twice."""
+    att_grid = np.zeros((len(cell_ys), len(cell_xs)))
+    for r, cy in enumerate(cell_ys):
+        for c, cx in enumerate(cell_xs):
+            dx, dy = cx - tx_x, cy - tx_y
+            for x1, y1, x2, y2, att in rects:
+                if x1 <= cx <= x2 and y1 <= cy <= y2:
+                    att_grid[r, c] += 2 * att
+                    continue
+                hit = False
+                if abs(dx) > 1e-6:
+                    for ex in (x1, x2):
+                        t = (ex - tx_x) / dx
+                        hit |= 0.01 < t < 0.99 and y1 <= tx_y + t * dy <= y2
+                if abs(dy) > 1e-6:
+                    for ey in (y1, y2):
+                        t = (ey - tx_y) / dy
+                        hit |= 0.01 < t < 0.99 and x1 <= tx_x + t * dx <= x2
+                if hit:
+                    att_grid[r, c] += att
+    return att_grid
+
+
+RECTS = np.array([
+    [100.0, 100.0, 250.0, 180.0, 12.0],
+    [300.0, 40.0, 320.0, 360.0, 6.0],
+    [20.0, 260.0, 140.0, 330.0, 9.0],
+])
+
+
+class TestShadowKernel:
+    @pytest.mark.parametrize("tx", [(153.3, 141.7), (61.2, 47.9), (377.4, 211.3)])
+    def test_matches_scalar_reference(self, tx):
+        cell_xs, cell_ys = app._cell_coords(40, 40, 10.0)
+        grid = app._shadow_kernel(tx[0], tx[1], cell_xs, cell_ys, RECTS)
+        np.testing.assert_allclose(grid, _ref_shadow(tx[0], tx[1], cell_xs, cell_ys, RECTS))
+
+    def test_transmitter_inside_obstacle(self):
+        # The ray leaves the obstacle only ~1 m short of cells just past its
+        # far edge (t > 0.99): those must not pay the attenuation
+        rect = np.array([[90.0, 120.0, 260.0, 394.0, 12.0]])
+        cell_xs, cell_ys = app._cell_coords(40, 40, 10.0)
+        grid = app._shadow_kernel(153.3, 141.7, cell_xs, cell_ys, rect)
+        np.testing.assert_allclose(grid, _ref_shadow(153.3, 141.7, cell_xs, cell_ys, rect))
+        assert grid[39, 15] == 0.0
+        assert grid[5, 15] == 12.0
+
+    @pytest.mark.parametrize("batch", [1, 2, 64])
+    def test_batch_size_does_not_change_result(self, monkeypatch, batch):
+        rng = np.random.default_rng(3)
+        xy = rng.uniform(0, 380, (12, 2))
+        wh = rng.uniform(5, 60, (12, 2))
+        rects = np.column_stack((xy, xy + wh, rng.uniform(3, 15, 12)))
+        cell_xs, cell_ys = app._cell_coords(40, 40, 10.0)
+        monkeypatch.setattr(app, "SHADOW_BATCH", 1)
+        per_obstacle = app._shadow_kernel(201.7, 188.2, cell_xs, cell_ys, rects)
+        monkeypatch.setattr(app, "SHADOW_BATCH", batch)
+        monkeypatch.setattr(app, "_SHADOW_CALL_CELLS", 10**9)  # always take the batched path
+        batched = app._shadow_kernel(201.7, 188.2, cell_xs, cell_ys, rects)
+        np.testing.assert_allclose(batched, per_obstacle, atol=1e-4)
+
+
+class TestShadowCache:
+    def test_hit_returns_equal_read_only_grid(self, monkeypatch):
+        monkeypatch.setattr(app, "_shadow_cache", app.OrderedDict())
+        monkeypatch.setattr(app, "_shadow_cache_nbytes", 0)
+        cell_xs, cell_ys = app._cell_coords(40, 40, 10.0)
+        grid = app._shadow_kernel(153.3, 141.7, cell_xs, cell_ys, RECTS)
+        key = (40, 40, 10.0, RECTS.tobytes(), 153.3, 141.7)
+        app._shadow_cache_put(key, grid.copy())
+        cached = app._shadow_cache_get(key)
+        np.testing.assert_array_equal(cached, grid)
+        assert not cached.flags.writeable
+        with pytest.raises(ValueError):
+            cached += 1.0
+        assert app._shadow_cache_get(("test", "missing")) is None
+
+
+def _ref_interferer_counts(device_info):
+    counts = np.zeros(len(device_info), dtype=np.intp)
+    for i, (f1, bw1, *_, tech1) in enumerate(device_info):
+        if tech1 == "power_meter":
+            continue
+        for j, (f2, bw2, *_, tech2) in enumerate(device_info):
+            if i != j and tech2 != "power_meter" and app.freqs_overlap(f1, bw1, f2, bw2):
+                counts[i] += 1
+    return counts
+
+
+class TestInterfererCounts:
+    @staticmethod
+    def _devices(channels, techs=None):
+        techs = techs or ["lorawan"] * len(channels)
+        return [(f, bw, 0.0, 0.0, 14.0, t) for (f, bw), t in zip(channels, techs)]
+
+    def test_empty(self):
+        assert app._interferer_counts([]).size == 0
+
+    def test_touching_channels_do_not_overlap(self):
+        devs = self._devices([(868.0, 250.0), (868.25, 250.0), (868.5, 250.0)])
+        np.testing.assert_array_equal(app._interferer_counts(devs), [0, 0, 0])
+        np.testing.assert_array_equal(app._interferer_counts(devs), _ref_interferer_counts(devs))
+
+    def test_zero_width_channels(self):
+        devs = self._devices([
+            (868.0, 0.0), (868.0, 0.0), (868.0, 200.0), (868.1, 0.0), (867.9, 0.0), (900.0, 0.0),
+        ])
+        np.testing.assert_array_equal(app._interferer_counts(devs), _ref_interferer_counts(devs))
+
+    def test_power_meters_neither_count_nor_are_counted(self):
+        devs = self._devices([(915.0, 500.0), (915.0, 125.0), (915.0, 50000.0)],
+                             ["halow", "lorawan", "power_meter"])
+        np.testing.assert_array_equal(app._interferer_counts(devs), [1, 1, 0])
+
+    def test_random_against_pairwise(self):
+        rng = np.random.default_rng(7)
+        # Coarse frequency and bandwidth steps so touching edges occur often
+        freqs = rng.integers(0, 12, 60) * 0.125 + 868.0
+        bws = rng.integers(0, 4, 60) * 125.0
+        techs = rng.choice(["lorawan", "nbiot", "power_meter"], 60, p=[0.45, 0.45, 0.1])
+        devs = self._devices(list(zip(freqs.tolist(), bws.tolist())), techs.tolist())
+        np.testing.assert_array_equal(app._interferer_counts(devs), _ref_interferer_counts(devs))
+
+
+class TestInterfererMerge:
+    CONFIG = {
+        "width_km": 0.5, "height_km": 0.4, "resolution_m": 10.0,
+        "devices": [
+            {"type": "lorawan_endpoint", "position": {"x": 0.1, "y": 0.1}, "label": "A"},
+            {"type": "lorawan_endpoint", "position": {"x": 0.1, "y": 0.1}, "label": "B"},
+            {"type": "lorawan_gateway", "position": {"x": 0.4, "y": 0.3}, "label": "GW"},
+        ],
+        "shadow_fading": False, "multipath_fading": False,
+    }
+
+    def test_coincident_sources_match_per_source_sum(self, monkeypatch):
+        captured = {}
+        counts = app._interferer_counts
+        simulation = app.Simulation
+
+        def spy_counts(device_info):
+            captured["info"] = list(device_info)
+            return counts(device_info)
+
+        def spy_sim(env, **kwargs):
+            captured["sim"] = simulation(env, **kwargs)
+            return captured["sim"]
+
+        monkeypatch.setattr(app, "_interferer_counts", spy_counts)
+        monkeypatch.setattr(app, "Simulation", spy_sim)
+        app.run_simulation(app.SimConfig.model_validate(self.CONFIG))
+
+        sim, info = captured["sim"], captured["info"]
+        merged = [ns for ns in sim.env.noise_sources if ns.label.startswith("interf_")]
+        # One source per overlapping pair (i, j) at device i, as before merging
+        per_source = [
+            app.NoiseSource(x=x, y=y, power_dbm=pwr - 10, frequency_mhz=f, bandwidth_khz=bw)
+            for (f, bw, x, y, pwr, _), n in zip(info, counts(info)) for _ in range(n)
+        ]
+        assert len(per_source) == 6
+        assert len(merged) == 2  # the two endpoints share position and channel
+
+        merged_grid = sim.interference_grid()
+        others = [ns for ns in sim.env.noise_sources if not ns.label.startswith("interf_")]
+        monkeypatch.setattr(sim.env, "noise_sources", others + per_source)
+        # float32 grids: summation order differs in the last ulp
+        np.testing.assert_allclose(merged_grid, sim.interference_grid(), atol=1e-4)
+
+
+class TestSimulateEndpoint:
+    def test_request_body_schema_in_openapi(self, client):
+        doc = client.get("/openapi.json").json()
+        body = doc["paths"]["/api/simulate"]["post"]["requestBody"]
+        assert body["content"]["application/json"]["schema"] == {"$ref": "#/components/schemas/SimConfig"}
+        schemas = doc["components"]["schemas"]
+        assert {"SimConfig", "RectObstacle", "Point"} <= set(schemas)
+        assert "width_km" in schemas["SimConfig"]["properties"]
+
+    def test_validation_errors_are_located_under_body(self, client):
+        r = client.post("/api/simulate", json={"width_km": "wide", "obstacles": [{"id": 1}]})
+        assert r.status_code == 422
+        locs = [tuple(err["loc"]) for err in r.json()["detail"]]
+        assert ("body", "width_km") in locs
+        assert ("body", "obstacles", 0, "id") in locs
+
+    def test_malformed_json(self, client):
+        r = client.post("/api/simulate", content=b"{not json")
+        assert r.status_code == 422
+        assert r.json()["detail"][0]["loc"][0] == "body"
+
+
+class TestGridEndpoint:
+    CONFIG = {
+        "width_km": 0.5, "height_km": 0.4, "resolution_m": 10.0,
+        "devices": [
+            {"type": "lorawan_gateway", "position": {"x": 0.2, "y": 0.2}, "label": "GW"},
+            {"type": "power_meter", "position": {"x": 0.4, "y": 0.1}, "label": "PM"},
+        ],
+        "obstacles": [{"id": "a", "type": "house", "position": {"x": 0.1, "y": 0.1},
+                       "width_km": 0.05, "height_km": 0.05}],
+        "shadow_fading": False, "multipath_fading": False,
+    }
+
+    @pytest.fixture
+    def simulated(self, client, monkeypatch):
+        monkeypatch.setattr(app, "_sim_cache", app.OrderedDict())
+        quantize = app.quantize_grid
+        raw = []
+
+        def capture(grid, scale, offset):
+            raw.append(np.array(grid, dtype=np.float64))
+            return quantize(grid, scale, offset)
+
+        monkeypatch.setattr(app, "quantize_grid", capture)
+        body = client.post("/api/simulate", json=self.CONFIG).json()
+        assert body["ok"]
+        # run_simulation quantizes the grids in GRID_KINDS order
+        return body["result"], dict(zip(app.GRID_KINDS, raw))
+
+    def test_grids_round_trip_within_one_step(self, client, simulated):
+        summary, raw = simulated
+        rows, cols = summary["grid_shape"]
+        for kind in app.GRID_KINDS:
+            r = client.get(f"/api/simulate/grid/{summary['handle']}/{kind}")
+            assert r.status_code == 200
+            assert r.headers["content-type"] == "application/octet-stream"
+            assert r.headers["x-shape"] == f"{rows}x{cols}"
+            enc = summary["grid_encoding"][kind]
+            assert float(r.headers["x-scale"]) == enc["scale"]
+            assert float(r.headers["x-offset"]) == enc["offset"]
+            q = np.frombuffer(r.content, dtype=np.uint8).reshape(rows, cols)
+            decoded = q * enc["scale"] + enc["offset"]
+            expected = np.clip(raw[kind], enc["offset"], enc["offset"] + 255 * enc["scale"])
+            assert np.abs(decoded - expected).max() <= enc["scale"]
+
+    def test_unknown_handle_or_kind_is_404(self, client, simulated):
+        summary, _ = simulated
+        assert client.get(f"/api/simulate/grid/{summary['handle']}/noise").status_code == 404
+        assert client.get("/api/simulate/grid/0123456789abcdef/rssi").status_code == 404
+
+
+class TestSimCache:
+    @pytest.fixture
+    def runs(self, monkeypatch):
+        monkeypatch.setattr(app, "_sim_cache", app.OrderedDict())
+        run = app.run_simulation
+        calls = []
+
+        def counting(config):
+            calls.append(config)
+            return run(config)
+
+        monkeypatch.setattr(app, "run_simulation", counting)
+        return calls
+
+    @staticmethod
+    def _config(**changes):
+        return app.SimConfig.model_validate({**TestGridEndpoint.CONFIG, **changes})
+
+    def test_identical_config_hits(self, runs):
+        key, first = app.run_simulation_cached(self._config())
+        # Same config built from differently ordered input
+        reordered = dict(reversed(list(TestGridEndpoint.CONFIG.items())))
+        key2, second = app.run_simulation_cached(app.SimConfig.model_validate(reordered))
+        assert key2 == key
+        assert second is first
+        assert len(runs) == 1
+
+    def test_changed_config_misses(self, runs):
+        key, first = app.run_simulation_cached(self._config())
+        key2, second = app.run_simulation_cached(self._config(resolution_m=20.0))
+        assert key2 != key
+        assert second is not first
+        assert len(runs) == 2
+
+    def test_evicts_least_recently_used(self, runs, monkeypatch):
+        monkeypatch.setattr(app, "SIM_CACHE_MAX_ENTRIES", 2)
+        a, b, c = (self._config(resolution_m=r) for r in (10.0, 20.0, 25.0))
+        key_a, _ = app.run_simulation_cached(a)
+        key_b, _ = app.run_simulation_cached(b)
+        app.run_simulation_cached(a)  # refresh a, so b is the oldest
+        key_c, _ = app.run_simulation_cached(c)
+        assert list(app._sim_cache) == [key_a, key_c]
+        app.run_simulation_cached(b)
+        assert len(runs) == 4
+
+    def test_byte_budget_keeps_latest_result(self, runs, monkeypatch):
+        monkeypatch.setattr(app, "SIM_CACHE_MAX_BYTES", 1)
+        app.run_simulation_cached(self._config())
+        key, _ = app.run_simulation_cached(self._config(resolution_m=20.0))
+        assert list(app._sim_cache) == [key]
@@ -47,6 +47,11 @@ class TestSegmentsIntersect:
     def test_disjoint(self):
         assert segments_intersect((0, 0), (1, 1), (5, 5), (6, 6)) is False
 
+    def test_touching_and_collinear_overlap(self):
+        assert segments_intersect((0, 0), (10, 0), (10, 0), (10, 5)) is True
+        assert segments_intersect((0, 0), (2, 0), (1, 0), (3, 0)) is True
+        assert segments_intersect((0, 0), (1, 0), (1.5, 0), (1.5, 1)) is False
+
 
 class TestObstacleCreation:
     def test_add_obstacle(self):
@@ -56,6 +61,26 @@ class TestObstacleCreation:
         assert len(env.obstacles) == 1
         assert env.obstacles[0].attenuation_db == 15.0
 
+    def test_obstacle_arrays_track_additions(self):
+        env = Environment(100, 100)
+        assert all(a.size == 0 for a in env.obstacle_arrays)
+        env.add_obstacle(Obstacle(start_point=(10, 0), end_point=(10, 100), attenuation_db=15.0))
+        env.add_obstacle(Obstacle(start_point=(0, 5), end_point=(50, 5), attenuation_db=3.0))
+        x1, y1, x2, y2, att = env.obstacle_arrays
+        assert x1.dtype == np.float64 and x1.flags.c_contiguous
+        np.testing.assert_array_equal(x1, [10, 0])
+        np.testing.assert_array_equal(y2, [100, 5])
+        np.testing.assert_array_equal(att, [15.0, 3.0])
+
+    def test_obstacle_segments_track_additions(self):
+        env = Environment(100, 100)
+        assert env.obstacle_segments.shape == (0, 2, 2)
+        env.add_obstacle(Obstacle(start_point=(10, 0), end_point=(10, 100)))
+        env.add_obstacle(Obstacle(start_point=(0, 5), end_point=(50, 5)))
+        segs = env.obstacle_segments
+        assert segs.shape == (2, 2, 2) and segs.flags.c_contiguous
+        np.testing.assert_array_equal(segs[1], [[0, 5], [50, 5]])
+
     def test_obstacle_attenuation_no_obstacles(self):
         env = Environment(100, 100)
         assert env.obstacle_attenuation(0, 0, 50, 50) == 0.0
@@ -94,3 +119,35 @@ class TestObstacleAttenuation:
         assert grid[0, 0] == 0.0
         # Points on the right side (x=10) should have 5 dB attenuation
         assert grid[0, 1] == pytest.approx(5.0)
+
+    def test_attenuation_grid_matches_pointwise(self):
+        env = Environment(60, 40, resolution=10)
+        env.add_obstacle(Obstacle(start_point=(20, 0), end_point=(20, 30), attenuation_db=3.0))
+        env.add_obstacle(Obstacle(start_point=(0, 20), end_point=(50, 20), attenuation_db=10.0))
+        env.add_obstacle(Obstacle(start_point=(5, 35), end_point=(55, 2), attenuation_db=7.0))
+        for sx, sy in [(0, 0), (10, 10), (20, 20), (33.3, 7.1)]:
+            grid = env.obstacle_attenuation_grid(sx, sy)
+            expected = np.array([
+                [env.obstacle_attenuation(sx, sy, float(gx), float(gy))
+                 for gx, gy in zip(row_x, row_y)]
+                for row_x, row_y in zip(env.grid_x, env.grid_y)
+            ])
+            np.testing.assert_array_equal(grid, expected)
+
+    def test_attenuation_grid_memo_invalidated_by_add_obstacle(self):
+        env = Environment(40, 40, resolution=10)
+        env.add_obstacle(Obstacle(start_point=(15, 0), end_point=(15, 40), attenuation_db=5.0))
+        first = env.obstacle_attenuation_view(0, 0)
+        assert env.obstacle_attenuation_view(0, 0) is first
+        assert not first.flags.writeable
+        env.add_obstacle(Obstacle(start_point=(25, 0), end_point=(25, 40), attenuation_db=7.0))
+        second = env.obstacle_attenuation_view(0, 0)
+        assert second is not first
+        assert second[0, 3] == pytest.approx(12.0)
+
+    def test_attenuation_grid_is_a_private_copy(self):
+        env = Environment(40, 40, resolution=10)
+        env.add_obstacle(Obstacle(start_point=(15, 0), end_point=(15, 40), attenuation_db=5.0))
+        grid = env.obstacle_attenuation_grid(0, 0)
+        grid += 1.0
+        np.testing.assert_array_equal(env.obstacle_attenuation_grid(0, 0), grid - 1.0)
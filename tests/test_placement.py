@@ -2,10 +2,13 @@
 
 import pytest
 
-from lpwan_sim.core.environment import Environment
+from lpwan_sim.core.environment import Environment, Obstacle
 from lpwan_sim.core.device import Transmitter, Gateway
+from lpwan_sim.core.simulation import Simulation, SimulationResult
 from lpwan_sim.protocols.lorawan import LoRaWAN
 from lpwan_sim.analysis.placement import (
+    _halton,
+    _virtual_transmitter,
     suggest_gateway_position,
     suggest_gateway_positions,
     coverage_score,
@@ -36,6 +39,15 @@ class TestCoverageScore:
         s_corner = coverage_score(env, [gw_corner], sensitivity_dbm=proto.sensitivity_dbm)
         assert s_centre >= s_corner
 
+    def test_cached_best_rssi_matches_full(self, small_env):
+        env, proto = small_env
+        placed = Gateway(x=0, y=0, protocol=proto)
+        candidate = Gateway(x=40, y=20, protocol=proto)
+        base = Simulation(env).transmitter_rssi(_virtual_transmitter(placed))
+        full = coverage_score(env, [placed, candidate])
+        incremental = coverage_score(env, [candidate], cached_best_rssi=base)
+        assert incremental == pytest.approx(full)
+
 
 class TestSuggestGatewayPosition:
     def test_returns_tuple(self, small_env):
@@ -47,6 +59,21 @@ class TestSuggestGatewayPosition:
         assert 0 <= y <= env.height
         assert 0 <= pct <= 100
 
+    def test_coarse_to_fine_matches_exhaustive(self, small_env):
+        env, proto = small_env
+        coarse = suggest_gateway_position(env, proto, step=10)
+        exhaustive = suggest_gateway_position(env, proto, step=10, coarse_factor=1)
+        assert coarse[2] == pytest.approx(exhaustive[2])
+
+    def test_pct_matches_simulated_gateway(self, small_env):
+        env, proto = small_env
+        env.add_obstacle(Obstacle(start_point=(20, 0), end_point=(20, 40), attenuation_db=40.0))
+        x, y, pct = suggest_gateway_position(env, proto, sensitivity_dbm=-90, step=10, coarse_factor=1)
+        sim = Simulation(env)
+        rssi = sim.transmitter_rssi(_virtual_transmitter(Gateway(x=x, y=y, protocol=proto)))
+        stats = sim.coverage_stats(SimulationResult(best_rssi=rssi, best_snr=rssi), sensitivity_dbm=-90)
+        assert pct == stats["coverage_pct"]
+
 
 class TestSuggestGatewayPositions:
     def test_single_gateway(self, small_env):
@@ -71,3 +98,13 @@ class TestSuggestGatewayPositions:
         for r in results:
             assert 0 <= r["x"] <= env.width
             assert 0 <= r["y"] <= env.height
+
+    def test_halton_coarse_candidates(self, small_env):
+        pts = _halton(8, 2)
+        assert list(pts[:4]) == [0.5, 0.25, 0.75, 0.125]
+        env, proto = small_env
+        results = suggest_gateway_positions(env, proto, n_gateways=2, n_coarse_candidates=16)
+        assert len(results) == 2
+        for r in results:
+            assert 0 <= r["x"] < env.width
+            assert 0 <= r["y"] < env.height
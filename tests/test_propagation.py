@@ -1,12 +1,16 @@
 """Tests for propagation models."""
 
+from functools import partial
+
 import numpy as np
 import pytest
 
 from lpwan_sim.propagation.pathloss import (
+    compute_rssi_grid,
     free_space_path_loss,
     log_distance_path_loss,
     okumura_hata,
+    okumura_hata_all,
 )
 from lpwan_sim.propagation.interference import noise_power_dbm, overlap_factor
 
@@ -23,6 +27,34 @@ class TestFSPL:
         assert pl2 > pl1
 
 
+class TestComputeRssiGrid:
+    def test_matches_separate_passes(self):
+        d = np.linspace(0.0, 5000.0, 64).reshape(8, 8)
+        obs = np.full_like(d, 12.0)
+        expected = 14.0 - free_space_path_loss(d, 868.0) - obs
+        np.testing.assert_array_equal(compute_rssi_grid(d, 868.0, 14.0, obs), expected)
+
+    def test_writes_over_distance_grid(self):
+        d = np.linspace(1.0, 5000.0, 64).reshape(8, 8)
+        expected = 14.0 - free_space_path_loss(d, 868.0)
+        rssi = compute_rssi_grid(d, 868.0, 14.0, out=d)
+        assert rssi is d
+        np.testing.assert_array_equal(rssi, expected)
+
+    def test_scalar_distance(self):
+        assert compute_rssi_grid(100.0, 868.0, 14.0) == pytest.approx(14.0 - free_space_path_loss(100.0, 868.0))
+        obs = np.array([0.0, 12.0])
+        np.testing.assert_allclose(
+            compute_rssi_grid(100.0, 868.0, 14.0, obs), 14.0 - free_space_path_loss(100.0, 868.0) - obs,
+        )
+
+    def test_other_model(self):
+        d = np.linspace(1.0, 5000.0, 64).reshape(8, 8)
+        expected = 14.0 - okumura_hata(d, 868.0, area="rural")
+        rssi = compute_rssi_grid(d, 868.0, 14.0, model=partial(okumura_hata, area="rural"))
+        np.testing.assert_array_equal(rssi, expected)
+
+
 class TestLogDistance:
     def test_equals_fspl_at_d0(self):
         pl_log = float(log_distance_path_loss(1.0, 868.0, n=2.0, d0=1.0))
@@ -42,6 +74,13 @@ class TestOkumuraHata:
         suburban = float(okumura_hata(d, 868.0, area="suburban"))
         assert urban > suburban
 
+    def test_all_areas_match_single_calls(self):
+        d = np.linspace(0.0, 20000.0, 101)
+        all_pl = okumura_hata_all(d, 868.0, h_bs=25.0, h_ms=2.0)
+        assert set(all_pl) == {"urban", "suburban", "rural"}
+        for area, pl in all_pl.items():
+            np.testing.assert_array_equal(pl, okumura_hata(d, 868.0, h_bs=25.0, h_ms=2.0, area=area))
+
 
 class TestNoise:
     def test_thermal_noise(self):
@@ -0,0 +1,58 @@
+"""Tests for the simulation engine."""
+
+import numpy as np
+
+from lpwan_sim.core.environment import Environment, Obstacle
+from lpwan_sim.core.device import Transmitter, NoiseSource
+from lpwan_sim.core.simulation import Simulation
+from lpwan_sim.protocols.lorawan import LoRaWAN
+
+
+def test_float32_policy():
+    results = {}
+    for dtype in (np.float64, np.float32):
+        env = Environment(200, 100, resolution=5, dtype=dtype)
+        env.add_transmitter(Transmitter(20, 30, LoRaWAN(), label="tx"))
+        env.add_noise_source(NoiseSource(150, 80, power_dbm=0))
+        env.add_obstacle(Obstacle(start_point=(100, 0), end_point=(100, 60), attenuation_db=10.0))
+        assert env.grid_x.dtype == dtype
+        results[dtype] = Simulation(env).run()
+    r64, r32 = results[np.float64], results[np.float32]
+    for name in ("best_rssi", "best_snr", "interference"):
+        assert getattr(r32, name).dtype == np.float32
+        np.testing.assert_allclose(getattr(r32, name), getattr(r64, name), atol=1e-3)
+
+
+def test_run_fast_matches_run():
+    env = Environment(200, 100, resolution=5)
+    env.add_transmitter(Transmitter(20, 30, LoRaWAN(), label="a"))
+    env.add_transmitter(Transmitter(180, 70, LoRaWAN(), label="b"))
+    env.add_noise_source(NoiseSource(100, 50, power_dbm=0))
+    sim = Simulation(env, shadow_fading_std=4.0)
+    np.random.seed(1)
+    full = sim.run()
+    np.random.seed(1)
+    fast = sim.run_fast()
+    assert fast.rssi == {} and fast.snr == {}
+    for name in ("best_rssi", "best_snr", "interference"):
+        np.testing.assert_array_equal(getattr(fast, name), getattr(full, name))
+
+
+def test_run_fast_folds_in_given_transmitters_and_grids():
+    env = Environment(200, 100, resolution=5)
+    env.add_noise_source(NoiseSource(100, 50, power_dbm=0))
+    sim = Simulation(env)
+    a = Transmitter(20, 30, LoRaWAN(), label="a")
+    b = Transmitter(180, 70, LoRaWAN(), label="b")
+    seed = sim.transmitter_rssi(a)
+    seed_before = seed.copy()
+    interference = sim.interference_grid()
+
+    fast = sim.run_fast([b], best_rssi=seed, interference=interference)
+    env.add_transmitter(a)
+    env.add_transmitter(b)
+    full = sim.run()
+    np.testing.assert_array_equal(seed, seed_before)
+    assert fast.interference is interference
+    for name in ("best_rssi", "best_snr", "interference"):
+        np.testing.assert_array_equal(getattr(fast, name), getattr(full, name))
@@ -0,0 +1,101 @@
+"""Tests for heatmap rendering."""
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+from matplotlib import image as mimage  # noqa: E402
+
+import numpy as np  # noqa: E402
+import pytest  # noqa: E402
+
+from lpwan_sim.core.device import Gateway  # noqa: E402
+from lpwan_sim.core.environment import Environment  # noqa: E402
+from lpwan_sim.core.simulation import Simulation  # noqa: E402
+from lpwan_sim.protocols.lorawan import LoRaWAN  # noqa: E402
+from lpwan_sim.visualization import heatmap  # noqa: E402
+from lpwan_sim.visualization.heatmap import HeatmapRenderer, plot_rssi, save_raw_png  # noqa: E402
+
+
+@pytest.fixture
+def env():
+    env = Environment(100, 100, resolution=10)
+    proto = LoRaWAN(spreading_factor=12)
+    env.add_gateway(Gateway(x=50, y=50, protocol=proto, sensitivity_dbm=proto.sensitivity_dbm))
+    return env
+
+
+class TestDownsample:
+    def test_small_grids_are_untouched(self):
+        data = np.zeros((700, 400))
+        assert heatmap._downsample(data, (1, 1)) is data
+
+    def test_block_means(self, monkeypatch):
+        monkeypatch.setattr(heatmap, "_DOWNSAMPLE_MIN_CELLS", 0)
+        data = np.random.default_rng(0).normal(size=(701, 403))
+        # 1x1 in at 150 dpi: rows reduce by 701 // 150 = 4, columns by 403 // 150 = 2
+        out = heatmap._downsample(data, (1, 1))
+        assert out.shape == (175, 201)
+        assert out[0, 0] == pytest.approx(data[0:4, 0:2].mean())
+        assert out[174, 200] == pytest.approx(data[696:700, 400:402].mean())
+
+    def test_nan_blanks_its_block(self, monkeypatch):
+        monkeypatch.setattr(heatmap, "_DOWNSAMPLE_MIN_CELLS", 0)
+        data = np.ones((700, 400))
+        data[5, 3] = np.nan
+        out = heatmap._downsample(data, (1, 1))
+        assert np.isnan(out[1, 1])
+        assert np.count_nonzero(np.isnan(out)) == 1
+
+
+class TestRawPng:
+    def test_one_pixel_per_cell_bottom_row_first(self, tmp_path):
+        data = np.arange(12.0).reshape(3, 4)
+        path = tmp_path / "raw.png"
+        save_raw_png(data, path, cmap="gray", vmin=0.0, vmax=11.0)
+        img = mimage.imread(str(path))
+        assert img.shape[:2] == data.shape
+        # PNG rows run top-down; grid row 0 is the bottom edge
+        np.testing.assert_allclose(img[::-1, :, 0], data / 11.0, atol=1.0 / 255)
+
+    def test_raw_only(self, env, tmp_path):
+        result = Simulation(env).run()
+        path = tmp_path / "rssi.png"
+        assert plot_rssi(result, env, save_path=path, raw_only=True) is None
+        assert mimage.imread(str(path)).shape[:2] == result.best_rssi.shape
+        with pytest.raises(ValueError):
+            plot_rssi(result, env, raw_only=True)
+
+
+class TestHeatmapRenderer:
+    def test_autoscales_both_bounds_per_frame(self, env):
+        renderer = HeatmapRenderer(env)
+        renderer.update(np.full((10, 10), -90.0) + np.eye(10) * 30.0)
+        assert (renderer.im.norm.vmin, renderer.im.norm.vmax) == (-90.0, -60.0)
+        renderer.update(np.full((10, 10), -130.0) + np.eye(10) * 10.0)
+        assert (renderer.im.norm.vmin, renderer.im.norm.vmax) == (-130.0, -120.0)
+
+    def test_only_vmin_given(self, env):
+        renderer = HeatmapRenderer(env, vmin=-140.0)
+        for hi in (-60.0, -100.0):
+            renderer.update(np.linspace(-120.0, hi, 100).reshape(10, 10))
+            assert renderer.im.norm.vmin == -140.0
+            assert renderer.im.norm.vmax == pytest.approx(hi)
+
+    def test_only_vmax_given(self, env):
+        renderer = HeatmapRenderer(env, vmax=-40.0)
+        for lo in (-120.0, -80.0):
+            renderer.update(np.linspace(lo, -60.0, 100).reshape(10, 10))
+            assert renderer.im.norm.vmin == pytest.approx(lo)
+            assert renderer.im.norm.vmax == -40.0
+
+
+class TestPlotRssi:
+    def test_renderer_must_match_env_and_grid_lines(self, env):
+        result = Simulation(env).run()
+        renderer = HeatmapRenderer(env)
+        assert plot_rssi(result, env, renderer=renderer) is renderer.fig
+        with pytest.raises(ValueError):
+            plot_rssi(result, Environment(100, 100, resolution=10), renderer=renderer)
+        with pytest.raises(ValueError):
+            plot_rssi(result, env, grid_lines=True, renderer=renderer)